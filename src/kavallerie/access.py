@@ -1,6 +1,5 @@
 import typing as t
 import logging
-from pathlib import PurePosixPath
 from kavallerie.response import Response
 from kavallerie.request import Request
 from kavallerie.pipeline import Handler
@@ -9,16 +8,49 @@ from kavallerie.pipeline import Handler
 Filter = t.Callable[[Handler, Request], Response | None]
 
 
+def segments(path: str) -> t.Iterator[str]:
+    """Segments of a path, ignoring empty and `.` segments, as
+    `PurePosixPath` does.
+    """
+    for segment in path.split('/'):
+        if segment and segment != '.':
+            yield segment
+
+
+class PathPrefixes:
+    """Trie of path segments, matching the paths equal to or below
+    one of the prefixes.
+    """
+
+    __slots__ = ('root',)
+
+    def __init__(self, prefixes: t.Iterable[str]):
+        self.root: dict = {}
+        for prefix in prefixes:
+            node = self.root
+            for segment in segments(prefix):
+                node = node.setdefault(segment, {})
+            node[None] = True  # end of a prefix.
+
+    def match(self, path: str) -> bool:
+        node = self.root
+        if None in node:
+            return True
+        for segment in segments(path):
+            node = node.get(segment)
+            if node is None:
+                return False
+            if None in node:
+                return True
+        return False
+
+
 def security_bypass(urls: t.Iterable[str]) -> Filter:
-    unprotected = frozenset(
-        PurePosixPath(bypass) for bypass in urls
-    )
+    unprotected = PathPrefixes(urls)
 
     def _filter(caller, request):
-        path = PurePosixPath(request.path)
-        for bypass in unprotected:
-            if path.is_relative_to(bypass):
-                return caller(request)
+        if unprotected.match(request.path):
+            return caller(request)
 
     return _filter
 
@@ -1,5 +1,7 @@
 import typing as t
 from collections import OrderedDict
+from functools import cached_property
+from itertools import count
 from prejudice.errors import ConstraintsErrors
 from prejudice.types import Predicate
 from prejudice.utils import resolve_constraints
@@ -20,7 +22,91 @@ class Action(t.NamedTuple):
                 self.conditions, self, *args, **kwargs)
 
 
+def order(action: Action) -> int:
+    if action.attributes:
+        return action.attributes.get("order", 99)
+    return 99
+
+
 class ActionStore(OrderedDict):
+    """Ordered mapping of actions by name.
+    The actions are indexed by classifier: the lookups by classifiers
+    do not scan all the actions.
+    `listener`, if set, is called when the actions change.
+    """
+
+    _postings: t.Dict[str, t.Set[str]]
+    _exact: t.Dict[t.FrozenSet[str], t.Set[str]]
+    _ranks: t.Dict[str, int]
+    listener: t.Optional[t.Callable[[], t.Any]] = None
+
+    def __init__(self, *args, **kwargs):
+        self._postings = {}
+        self._exact = {}
+        self._ranks = {}
+        self._counter = count()
+        super().__init__(*args, **kwargs)
+
+    def _index(self, name: str, action: Action):
+        for classifier in action.classifiers:
+            self._postings.setdefault(classifier, set()).add(name)
+        self._exact.setdefault(action.classifiers, set()).add(name)
+
+    def _unindex(self, name: str, action: Action):
+        for classifier in action.classifiers:
+            names = self._postings[classifier]
+            names.discard(name)
+            if not names:
+                del self._postings[classifier]
+        names = self._exact[action.classifiers]
+        names.discard(name)
+        if not names:
+            del self._exact[action.classifiers]
+
+    def _ordered(self, names: t.Iterable[str]) -> t.Iterator[Action]:
+        for name in sorted(names, key=self._ranks.__getitem__):
+            yield self[name]
+
+    def __setitem__(self, name: str, action: Action):
+        if name in self:
+            self._unindex(name, self[name])
+        else:
+            self._ranks[name] = next(self._counter)
+        super().__setitem__(name, action)
+        self._index(name, action)
+        self._changed()
+
+    def __delitem__(self, name: str):
+        self._unindex(name, self[name])
+        del self._ranks[name]
+        super().__delitem__(name)
+        self._changed()
+
+    def _changed(self):
+        if self.listener is not None:
+            self.listener()
+
+    def pop(self, name: str, *default):
+        if name in self:
+            action = self[name]
+            del self[name]
+            return action
+        if default:
+            return default[0]
+        raise KeyError(name)
+
+    def popitem(self, last: bool = True) -> t.Tuple[str, Action]:
+        if not self:
+            raise KeyError('dictionary is empty')
+        name = next(reversed(self)) if last else next(iter(self))
+        return name, self.pop(name)
+
+    def clear(self):
+        super().clear()
+        self._postings.clear()
+        self._exact.clear()
+        self._ranks.clear()
+        self._changed()
 
     def add(self,
             func: t.Callable,
@@ -49,34 +135,32 @@ class ActionStore(OrderedDict):
     def partial(self, *classifiers: str) -> t.Generator[Action, None, None]:
         if not classifiers:
             raise KeyError('`partial` takes at least one classifier.')
-        classifiers = set(classifiers)
-        for action in self.values():
-            if action.classifiers >= classifiers:
-                yield action
+        postings = [self._postings.get(c) for c in set(classifiers)]
+        if all(postings):
+            yield from self._ordered(set.intersection(*postings))
 
     def exact(self, *classifiers: str) -> t.Generator[Action, None, None]:
         if not classifiers:
             raise KeyError('`exact` takes at least one classifier.')
-        classifiers = set(classifiers)
-        for action in self.values():
-            if classifiers == action.classifiers:
-                yield action
+        yield from self._ordered(
+            self._exact.get(frozenset(classifiers), ()))
 
     def one_of(self, *classifiers: str) -> t.Generator[Action, None, None]:
         if not classifiers:
             raise KeyError('`one_of` takes at least one classifier.')
-        classifiers = set(classifiers)
-        for action in self.values():
-            if action.classifiers & classifiers:
-                yield action
+        yield from self._ordered(set().union(*(
+            self._postings.get(c, ()) for c in classifiers)))
 
 
 class Actions:
 
     _library: t.Mapping[t.Type, ActionStore]
+    _index: t.Dict[
+        t.Tuple[t.Type, t.FrozenSet[str], str], t.Tuple[Action, ...]]
 
     def __init__(self):
         self._library = {}
+        self._index = {}
 
     @staticmethod
     def lineage(cls):
@@ -86,17 +170,38 @@ class Actions:
             yield parent
 
     def register(self, cls, *args, **kwargs):
-        actions = self._library.get(cls, None)
-        if actions is None:
-            actions = self._library[cls] = ActionStore()
-        return actions.register(*args, **kwargs)
+        def register_resolver(func):
+            self.add(func, cls, *args, **kwargs)
+            return func
+        return register_resolver
 
     def add(self, func, cls, *args, **kwargs):
         actions = self._library.get(cls, None)
         if actions is None:
             actions = self._library[cls] = ActionStore()
+            # Changes made through `get_actions_for` invalidate too.
+            actions.listener = self._index.clear
         return actions.add(func, *args, **kwargs)
 
+    def lookup(self, cls, *classifiers: str,
+               mode: str = 'partial') -> t.Tuple[Action, ...]:
+        """Returns the actions of the class lineage matching the
+        classifiers, sorted by order. Without classifiers, all the
+        actions are returned. `mode` is one of `partial`, `exact` and
+        `one_of`. The result is cached until the actions change.
+        """
+        key = (cls, frozenset(classifiers), mode)
+        found = self._index.get(key)
+        if found is None:
+            if classifiers:
+                if mode not in ('partial', 'exact', 'one_of'):
+                    raise ValueError(f'Unknown lookup mode: {mode!r}.')
+                actions = getattr(self, mode)(cls, *classifiers)
+            else:
+                actions = self.all_actions_for(cls)
+            found = self._index[key] = tuple(sorted(actions, key=order))
+        return found
+
     def get_actions_for(self, cls):
         return self._library.get(cls)
 
@@ -114,42 +219,45 @@ class Actions:
     def partial(self, cls, *classifiers: str) -> t.Iterator[Action]:
         if not classifiers:
             raise KeyError('`partial` takes at least one classifier.')
-        classifiers = set(classifiers)
         for cls in self.lineage(cls):
             if cls in self._library:
-                for action in self._library[cls].values():
-                    if action.classifiers >= classifiers:
-                        yield action
+                yield from self._library[cls].partial(*classifiers)
 
     def exact(self, cls, *classifiers: str):
         if not classifiers:
             raise KeyError('`exact` takes at least one classifier.')
-        classifiers = set(classifiers)
         for cls in self.lineage(cls):
             if cls in self._library:
-                for action in self._library[cls].values():
-                    if classifiers == action.classifiers:
-                        yield action
+                yield from self._library[cls].exact(*classifiers)
 
     def one_of(self, cls,
                *classifiers: str) -> t.Generator[Action, None, None]:
         if not classifiers:
             raise KeyError('`one_of` takes at least one classifier.')
-        classifiers = set(classifiers)
         for cls in self.lineage(cls):
             if cls in self._library:
-                for action in self._library[cls].values():
-                    if action.classifiers & classifiers:
-                        yield action
+                yield from self._library[cls].one_of(*classifiers)
+
+
+def html_link(url: str, title: str, css: str, active: bool) -> str:
+    ncss = "nav-link active" if active else "nav-link"
+    return (
+        f'<a class="{ncss}" href="{url}"> '
+        f'<i class="{css}"> </i>'
+        f"{title}</a>"
+    )
 
 
 class ContextualAction(t.NamedTuple):
     context: t.Any
     request: Request
     action: Action
+    origin: t.Optional['ContextualActions'] = None
 
     @property
     def url(self):
+        if self.origin is not None:
+            return self.origin.resolve(self.action, self.context)
         return self.action.resolve(self.request, self.context)
 
     @property
@@ -164,6 +272,8 @@ class ContextualAction(t.NamedTuple):
 
     @property
     def active(self):
+        if self.origin is not None:
+            return self.origin.is_active(self.url)
         prefix_len = len(self.request.script_name)
         url = self.request.application_uri + self.url[prefix_len:]
         return self.request.uri().startswith(url)
@@ -172,48 +282,80 @@ class ContextualAction(t.NamedTuple):
         url = self.url
         if url is None:
             return
-        ncss = "nav-link active" if self.active else "nav-link"
-        return (
-            f'<a class="{ncss}" href="{url}"> '
-            f'<i class="{self.css}"> </i>'
-            f"{self.action.title}</a>"
-        )
+        return html_link(url, self.action.title, self.css, self.active)
 
 
 class ContextualActions:
+    """Actions bound to a request.
+    The evaluations of the conditions and the resolved URLs are
+    memoized per action and context, for the lifetime of the instance.
+    """
 
     def __init__(self, request: Request, actions: Actions):
         self.request = request
         self.actions = actions
+        # Values hold the action and the context, for their ids
+        # not to be reused while memoized.
+        self._evaluations: t.Dict[
+            t.Tuple[int, int],
+            t.Tuple[Action, t.Any, t.Optional[ConstraintsErrors]]] = {}
+        self._urls: t.Dict[
+            t.Tuple[int, int], t.Tuple[Action, t.Any, t.Optional[str]]] = {}
+
+    @cached_property
+    def uri(self) -> str:
+        return self.request.uri()
+
+    def is_active(self, url: str) -> bool:
+        prefix_len = len(self.request.script_name)
+        return self.uri.startswith(
+            self.request.application_uri + url[prefix_len:])
+
+    def evaluate(self, action: Action,
+                 context: t.Any) -> t.Optional[ConstraintsErrors]:
+        key = (id(action), id(context))
+        if (found := self._evaluations.get(key)) is not None:
+            return found[2]
+        errors = action.evaluate(context=context, request=self.request)
+        self._evaluations[key] = (action, context, errors)
+        return errors
+
+    def resolve(self, action: Action, context: t.Any) -> t.Optional[str]:
+        key = (id(action), id(context))
+        if (found := self._urls.get(key)) is not None:
+            return found[2]
+        url = action.resolve(self.request, context)
+        self._urls[key] = (action, context, url)
+        return url
 
     def get(self, name, context: t.Any = None) -> ContextualAction:
         if context is None:
             context = self.request.app
         action = self.actions.get_action_for(context.__class__, name)
-        if action is not None and \
-           action.evaluate(context=context, request=self.request) is None:
+        if action is not None and self.evaluate(action, context) is None:
             return ContextualAction(
-                context=context, request=self.request, action=action)
+                context=context, request=self.request,
+                action=action, origin=self)
 
     def iter(self, classifiers: t.Iterable[str] = tuple(),
              context: t.Any = None) -> t.Iterable[ContextualAction]:
-
-        def order(action):
-            if action.attributes:
-                return action.attributes.get("order", 99)
-            return 99
-
         if context is None:
             context = self.request.app
-        if classifiers:
-            actions = list(
-                self.actions.partial(context.__class__, *classifiers))
-        else:
-            actions = list(
-                self.actions.all_actions_for(context.__class__))
-
-        actions.sort(key=order)
+        actions = self.actions.lookup(context.__class__, *classifiers)
         for action in actions:
-            if action.evaluate(context=context, request=self.request) is None:
+            if self.evaluate(action, context) is None:
                 yield ContextualAction(
-                    context=context, request=self.request, action=action)
+                    context=context, request=self.request,
+                    action=action, origin=self)
+
+    def render(self, classifiers: t.Iterable[str] = tuple(),
+               context: t.Any = None) -> str:
+        """Renders the HTML links of the actions, in one string.
+        """
+        links = []
+        for item in self.iter(classifiers, context):
+            url = item.url
+            if url is not None:
+                links.append(html_link(
+                    url, item.action.title, item.css, self.is_active(url)))
+        return ''.join(links)
@@ -1,19 +1,63 @@
+import sys
 import typing as t
 import horseman.parsers
 from dataclasses import dataclass, field
+from inspect import iscoroutinefunction
 from horseman.exceptions import HTTPError
 from horseman.mapping import RootNode
-from horseman.types import Environ, ExceptionInfo
-from kavallerie.request import Request
-from kavallerie.response import Response
+from horseman.types import Environ, ExceptionInfo, StartResponse
+from kavallerie.request import Request, AsyncRequest
+from kavallerie.response import Response, FileBody
 from kavallerie.events import Subscribers
+from kavallerie.pipeline import run_in_thread
 from kavallerie.routes import Routes
-from kavallerie import meta
+from kavallerie import asgi, meta
 
 
 @dataclass
 class Application(meta.Application, RootNode):
     request_factory: t.Type[Request] = Request
+    async_request_factory: t.Type[AsyncRequest] = AsyncRequest
+
+    def __call__(self, *args):
+        """WSGI `(environ, start_response)` or
+        ASGI `(scope, receive, send)` entry point.
+        """
+        if len(args) == 3:
+            return self.asgi(*args)
+        return self.wsgi(*args)
+
+    def wsgi(self, environ: Environ, start_response: StartResponse):
+        """Resolves the response before iterating it: file responses
+        directly return the server `wsgi.file_wrapper`, allowing the
+        use of `sendfile`.
+        """
+        try:
+            response = self.resolve(environ)
+        except Exception:
+            response = self.handle_exception(sys.exc_info(), environ)
+            if response is None:
+                raise
+        if isinstance(getattr(response, 'body', None), FileBody):
+            return response(environ, start_response)
+        return self.iterate(response, environ, start_response)
+
+    def iterate(self, response, environ: Environ,
+                start_response: StartResponse):
+        try:
+            yield from response(environ, start_response)
+        except Exception:
+            response = self.handle_exception(sys.exc_info(), environ)
+            if response is None:
+                raise
+            yield from response(environ, start_response)
+        finally:
+            if (closer := getattr(response, 'close', None)) is not None:
+                try:
+                    closer()
+                except Exception:
+                    self.handle_exception(sys.exc_info(), environ)
+                    raise
 
     def handle_exception(self, exc_info: ExceptionInfo, environ: Environ):
         cls, exc, tb = exc_info
@@ -23,20 +67,81 @@ class Application(meta.Application, RootNode):
     def endpoint(self, request) -> Response:
         raise NotImplementedError('Implement your own.')
 
+    async def endpoint_async(self, request: AsyncRequest) -> Response:
+        await request.read()
+        return await run_in_thread(self.endpoint, request)
+
     def resolve(self, environ: Environ) -> Response:
         request = self.request_factory(self, environ)
         endpoint = self.pipeline.wrap(self.endpoint, self.config)
         return endpoint(request)
 
+    async def resolve_async(self,
+                            environ: Environ,
+                            receive: asgi.Receive) -> Response:
+        request = self.async_request_factory(self, environ, receive)
+        # The body is received before the middlewares run: blocking
+        # middlewares read `body` and `data` as they would under WSGI.
+        await request.read()
+        endpoint = self.pipeline.wrap(self.endpoint_async, self.config)
+        return await endpoint(request)
+
+    async def asgi(self,
+                   scope: asgi.Scope,
+                   receive: asgi.Receive,
+                   send: asgi.Send):
+        if scope['type'] == 'lifespan':
+            return await asgi.lifespan(scope, receive, send)
+        if scope['type'] != 'http':
+            raise NotImplementedError(
+                f"Unsupported ASGI scope type: {scope['type']!r}.")
+
+        environ = asgi.environ_from_scope(scope)
+        try:
+            response = await self.resolve_async(environ, receive)
+        except Exception:
+            response = self.handle_exception(sys.exc_info(), environ)
+            if response is None:
+                raise
+        try:
+            await asgi.send_response(response, send)
+        finally:
+            if (closer := getattr(response, 'close', None)) is not None:
+                closer()
+
 
 @dataclass
 class RoutingApplication(Application):
     routes: Routes = field(default_factory=Routes)
 
+    def match(self, request: Request) -> t.Optional[meta.Route]:
+        """Matches the route of the request, once.
+        Middlewares may call it to inspect `request.route` before
+        the endpoint is reached.
+        """
+        if request.route is None:
+            request.route = self.routes.match_method(
+                request.path, request.method)
+        return request.route
+
     def endpoint(self, request: Request) -> Response:
-        route = self.routes.match_method(request.path, request.method)
+        route = self.match(request)
         if route is None:
             raise HTTPError(404)
-
-        request.route = route
         return route.endpoint(request, **route.params)
+
+    async def endpoint_async(self, request: AsyncRequest) -> Response:
+        route = self.match(request)
+        if route is None:
+            raise HTTPError(404)
+        endpoint = route.endpoint.endpoint
+        if iscoroutinefunction(endpoint):
+            return await route.endpoint(request, **route.params)
+        if (async_endpoint := getattr(
+                endpoint, 'async_endpoint', None)) is not None:
+            # Blocking endpoint composed with a route pipeline.
+            await request.read()
+            return await async_endpoint(request, **route.params)
+        await request.read()
+        return await run_in_thread(
+            route.endpoint, request, **route.params)
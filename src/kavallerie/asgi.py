@@ -0,0 +1,107 @@
+import sys
+import typing as t
+from io import BytesIO
+from horseman.types import Environ
+from kavallerie.pipeline import run_in_thread
+
+
+Scope = t.MutableMapping[str, t.Any]
+Message = t.MutableMapping[str, t.Any]
+Receive = t.Callable[[], t.Awaitable[Message]]
+Send = t.Callable[[Message], t.Awaitable[None]]
+
+_EXHAUSTED = object()
+
+
+def environ_from_scope(scope: Scope) -> Environ:
+    """Creates a WSGI environ from an ASGI HTTP scope.
+    The body is not read: `wsgi.input` is an empty buffer, replaced
+    by `kavallerie.request.AsyncRequest.read`.
+    """
+    path = scope['path']
+    script_name = scope.get('root_path', '')
+    if script_name and path.startswith(script_name):
+        path = path[len(script_name):]
+
+    server_name, server_port = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': script_name.encode('utf-8').decode('latin-1'),
+        'PATH_INFO': path.encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server_name,
+        'SERVER_PORT': str(server_port),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.version': (1, 0),
+        'wsgi.input': BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+        'asgi.scope': scope,
+    }
+    if client := scope.get('client'):
+        environ['REMOTE_ADDR'], environ['REMOTE_PORT'] = \
+            client[0], str(client[1])
+
+    for name, value in scope.get('headers', ()):
+        name = name.decode('latin-1')
+        value = value.decode('latin-1')
+        if name == 'content-type':
+            key = 'CONTENT_TYPE'
+        elif name == 'content-length':
+            key = 'CONTENT_LENGTH'
+        else:
+            key = 'HTTP_' + name.upper().replace('-', '_')
+        if key in environ:
+            value = f'{environ[key]},{value}'
+        environ[key] = value
+    return environ
+
+
+async def send_response(response, send: Send):
+    await send({
+        'type': 'http.response.start',
+        'status': int(response.status),
+        'headers': [
+            (name.encode('latin-1'), value.encode('latin-1'))
+            for name, value in response.headers.items()
+        ]
+    })
+    if hasattr(response.body, '__aiter__'):
+        async for chunk in response.body:
+            await send({
+                'type': 'http.response.body',
+                'body': chunk,
+                'more_body': True
+            })
+    elif response.body is None or isinstance(response.body, (bytes, str)):
+        for chunk in response:
+            await send({
+                'type': 'http.response.body',
+                'body': chunk,
+                'more_body': True
+            })
+    else:
+        # Iterable bodies may block, such as file reads or generators
+        # over a database cursor: chunks are pulled in a worker thread.
+        iterator = iter(response)
+        while (chunk := await run_in_thread(
+                next, iterator, _EXHAUSTED)) is not _EXHAUSTED:
+            await send({
+                'type': 'http.response.body',
+                'body': chunk,
+                'more_body': True
+            })
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+async def lifespan(scope: Scope, receive: Receive, send: Send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
@@ -1,5 +1,6 @@
 import bisect
 import typing as t
+from operator import itemgetter
 
 
 I = t.TypeVar('I')
@@ -22,14 +23,15 @@ class PriorityChain(t.Generic[I]):
         if not self._chain:
             self._chain = [insert]
         elif insert in self._chain:
-            raise KeyError('Item {item!r} already exists at #{order}.')
+            raise KeyError(f'Item {item!r} already exists at #{order}.')
         else:
-            bisect.insort(self._chain, insert)
+            # Items of the same order keep their insertion order.
+            bisect.insort(self._chain, insert, key=itemgetter(0))
 
     def remove(self, item: I, order: int):
         insert = (order, item)
         if insert not in self._chain:
-            raise KeyError('Item {item!r} doest not exist at #{order}.')
+            raise KeyError(f'Item {item!r} doest not exist at #{order}.')
         self._chain.remove(insert)
 
     def clear(self):
@@ -1,63 +1,162 @@
-from typing import Iterable, NamedTuple, Tuple, Iterator
+import re
+from functools import cached_property
+from typing import ClassVar, Iterable, NamedTuple, Pattern, Tuple, Iterator
 from horseman.types import HTTPMethod
 from horseman.response import Headers
+from kavallerie.datastructures import LRUCache
 
 
-class CORSPolicy(NamedTuple):
+HeaderItems = Tuple[Tuple[str, str], ...]
+
+
+class CORSPolicyFields(NamedTuple):
     origin: str = "*"
     methods: Iterable[HTTPMethod] | None = None
     allow_headers: Iterable[str] | None = None
     expose_headers: Iterable[str] | None = None
     credentials: bool | None = None
     max_age: int | None = None
+    origins: Iterable[str] | None = None
+    origin_patterns: Iterable[str | Pattern] | None = None
+
+
+def origin_regex(pattern: str | Pattern) -> str:
+    """Regular expression of an origin pattern: either a compiled
+    expression or a string where `*` matches a part of a host name,
+    such as `https://*.example.com`.
+    """
+    if isinstance(pattern, re.Pattern):
+        return pattern.pattern
+    return re.escape(pattern).replace(r'\*', r'[^/:]+')
+
+
+class CORSPolicy(CORSPolicyFields):
+    """CORS headers policy.
+    The policy is immutable: header values are joined once and the
+    preflight headers are cached by request values, in a LRU cache of
+    `preflight_cache_size` entries.
 
-    def headers(self) -> Headers:
-        headers = Headers()
-        headers["Access-Control-Allow-Origin"] = self.origin
+    With `origins` or `origin_patterns`, several origins are allowed:
+    an allowed request origin is sent back as is. Exact origins are
+    looked up in a set, the patterns are combined in one expression.
+    """
+
+    preflight_cache_size: ClassVar[int] = 256
+
+    @cached_property
+    def _values(self) -> dict[str, str]:
+        values = {}
         if self.methods is not None:
-            values = ", ".join(self.methods)
-            headers["Access-Control-Allow-Methods"] = values
+            values["Access-Control-Allow-Methods"] = ", ".join(self.methods)
         if self.allow_headers is not None:
-            values = ", ".join(self.allow_headers)
-            headers["Access-Control-Allow-Headers"] = values
+            values["Access-Control-Allow-Headers"] = ", ".join(
+                self.allow_headers)
         if self.expose_headers is not None:
-            values = ", ".join(self.expose_headers)
-            headers["Access-Control-Expose-Headers"] = values
+            values["Access-Control-Expose-Headers"] = ", ".join(
+                self.expose_headers)
+        return values
+
+    @cached_property
+    def _origins(self) -> frozenset[str]:
+        origins = set(self.origins or ())
+        if self.origin != '*':
+            origins.add(self.origin)
+        return frozenset(origins)
+
+    @cached_property
+    def _origin_pattern(self) -> Pattern | None:
+        if not self.origin_patterns:
+            return None
+        return re.compile('|'.join(
+            f'(?:{origin_regex(pattern)})'
+            for pattern in self.origin_patterns
+        ))
+
+    @property
+    def multiple_origins(self) -> bool:
+        return self.origins is not None or self.origin_patterns is not None
+
+    def origin_allowed(self, origin: str) -> bool:
+        if not self.multiple_origins:
+            return self.origin in ('*', origin)
+        if origin in self._origins:
+            return True
+        return self._origin_pattern is not None and (
+            self._origin_pattern.fullmatch(origin) is not None)
+
+    @cached_property
+    def _headers(self) -> HeaderItems:
+        items = list(self._values.items())
         if self.max_age is not None:
-            headers["Access-Control-Max-Age"] = str(self.max_age)
+            items.append(("Access-Control-Max-Age", str(self.max_age)))
         if self.credentials:
-            headers["Access-Control-Allow-Credentials"] = "true"
-        return headers
+            items.append(("Access-Control-Allow-Credentials", "true"))
+        return tuple(items)
 
-    def preflight(self,
-                  origin: str | None = None,
-                  acr_method: str | None = None,
-                  acr_headers: str | None = None) -> Headers:
+    @cached_property
+    def _preflights(self) -> LRUCache:
+        return LRUCache(self.preflight_cache_size)
+
+    def headers(self, origin: str | None = None) -> Headers:
+        if origin is None:
+            if self.multiple_origins:
+                # No origin to match: none is allowed.
+                return Headers(self._headers)
+            return Headers((
+                ("Access-Control-Allow-Origin", self.origin),
+                *self._headers
+            ))
+        return Headers((*self.allowed_origin(origin), *self._headers))
 
-        headers = Headers()
+    def allowed_origin(self, origin: str) -> Iterator[Tuple[str, str]]:
+        if self.multiple_origins:
+            if self.origin_allowed(origin):
+                yield "Access-Control-Allow-Origin", origin
+        elif self.origin == '*':
+            yield "Access-Control-Allow-Origin", '*'
+            return
+        else:
+            yield "Access-Control-Allow-Origin", self.origin
+        yield "Vary", 'Origin'
+
+    def preflight_items(self,
+                        origin: str | None = None,
+                        acr_method: str | None = None,
+                        acr_headers: str | None = None) -> HeaderItems:
+        items = []
         if origin:
-            if self.origin == '*':
-                headers["Access-Control-Allow-Origin"] = '*'
-            elif origin == self.origin:
-                headers["Access-Control-Allow-Origin"] = origin
-                headers["Vary"] = 'Origin'
-            else:
-                headers["Access-Control-Allow-Origin"] = self.origin
-                headers["Vary"] = 'Origin'
+            items.extend(self.allowed_origin(origin))
 
         if self.methods is not None:
-            headers["Access-Control-Allow-Methods"] = ", ".join(self.methods)
+            items.append((
+                "Access-Control-Allow-Methods",
+                self._values["Access-Control-Allow-Methods"]
+            ))
         elif acr_method:
-            headers["Access-Control-Allow-Methods"] = acr_method
+            items.append(("Access-Control-Allow-Methods", acr_method))
 
         if self.allow_headers is not None:
-            values = ", ".join(self.allow_headers)
-            headers["Access-Control-Allow-Headers"] = values
+            items.append((
+                "Access-Control-Allow-Headers",
+                self._values["Access-Control-Allow-Headers"]
+            ))
         elif acr_headers:
-            headers["Access-Control-Allow-Headers"] = acr_headers
+            items.append(("Access-Control-Allow-Headers", acr_headers))
 
         if self.expose_headers is not None:
-            values = ", ".join(self.expose_headers)
-            headers["Access-Control-Expose-Headers"] = values
+            items.append((
+                "Access-Control-Expose-Headers",
+                self._values["Access-Control-Expose-Headers"]
+            ))
+        return tuple(items)
 
-        return headers
+    def preflight(self,
+                  origin: str | None = None,
+                  acr_method: str | None = None,
+                  acr_headers: str | None = None) -> Headers:
+        key = (origin, acr_method, acr_headers)
+        items = self._preflights.get(key)
+        if items is None:
+            items = self._preflights[key] = self.preflight_items(
+                origin, acr_method, acr_headers)
+        return Headers(items)
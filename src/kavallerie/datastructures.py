@@ -1,6 +1,8 @@
+from collections import OrderedDict
 from frozendict import frozendict
 from typing import (
     cast, Optional, Union, Any, Mapping, List, Iterable, Tuple, Dict)
+from horseman.utils import parse_header
 
 
 Pairs = Iterable[Tuple[str, Any]]
@@ -73,3 +75,84 @@ class TypeCastingDict(MultiDict):
 
     def float(self, key: str, default=...):
         return float(self.get(key, default))
+
+
+class Accept(Tuple[Tuple[str, float], ...]):
+    """Values of an `Accept*` header, by descending quality.
+    """
+
+    @classmethod
+    def from_string(cls, value: str) -> 'Accept':
+        entries = []
+        for item in value.split(','):
+            name, params = parse_header(item)
+            if not name:
+                continue
+            try:
+                quality = float(params.get('q', 1))
+            except ValueError:
+                quality = 0.0
+            entries.append((name.lower(), quality))
+        # The sort is stable: the order of the header is kept
+        # for values of the same quality.
+        entries.sort(key=lambda entry: entry[1], reverse=True)
+        return cls(entries)
+
+    def quality(self, offer: str) -> float:
+        """Quality of the most specific value matching the offer:
+        an exact match, then `type/*`, then `*` or `*/*`.
+        """
+        offer = offer.lower()
+        found, specificity = 0.0, -1
+        for name, quality in self:
+            if name == offer:
+                return quality
+            if name in ('*', '*/*'):
+                level = 0
+            elif name.endswith('/*') and offer.startswith(name[:-1]):
+                level = 1
+            else:
+                continue
+            if level > specificity:
+                found, specificity = quality, level
+        return found
+
+    def best(self, *offers: str) -> Optional[str]:
+        """Returns the acceptable offer of highest quality.
+        """
+        best, best_quality = None, 0.0
+        for offer in offers:
+            quality = self.quality(offer)
+            if quality > best_quality:
+                best, best_quality = offer, quality
+        return best
+
+
+class LRUCache(OrderedDict):
+    """Mapping bounded to `maxsize` items.
+    The least recently used items are evicted first.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        if maxsize < 1:
+            raise ValueError('`maxsize` must be a positive integer.')
+        super().__init__()
+        self.maxsize = maxsize
+
+    def get(self, key: Any, default: Optional[Any] = None) -> Any:
+        try:
+            value = self[key]
+            self.move_to_end(key)
+        except KeyError:
+            # Missing or concurrently evicted.
+            return default
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            try:
+                self.popitem(last=False)
+            except KeyError:
+                break
@@ -1,9 +1,12 @@
 import abc
+import asyncio
 import collections.abc
 import typing as t
 from inspect import isclass, signature
+from operator import itemgetter
 from prejudice.types import Predicate, Predicates
 from prejudice.utils import resolve_constraints
+from kavallerie.components import PriorityChain
 
 
 class Event(abc.ABC):
@@ -30,6 +33,33 @@ class Event(abc.ABC):
         return f"<Event({lineage})>"
 
 
+class Batch(Event):
+    """Events of a same type, notified at once.
+    `Batch[SomeEvent]` is the batch type of `SomeEvent`. It derives
+    from the batch types of the parents of `SomeEvent`: batch types
+    follow the event lineage.
+    """
+
+    event_type: t.ClassVar[t.Type[Event]] = Event
+    _batch_types: t.ClassVar[t.Dict[t.Type[Event], t.Type['Batch']]] = {}
+
+    def __init__(self, events: t.Sequence[Event]):
+        self.events = events
+
+    def __class_getitem__(cls, event_type: t.Type[Event]) -> t.Type['Batch']:
+        batch_type = cls._batch_types.get(event_type)
+        if batch_type is None:
+            bases = tuple(
+                cls[parent] for parent in event_type.__bases__
+                if parent is not Event and issubclass(parent, Event)
+            ) or (cls,)
+            batch_type = cls._batch_types[event_type] = type(
+                f'Batch[{event_type.__name__}]', bases,
+                {'event_type': event_type}
+            )
+        return batch_type
+
+
 Subscriber = t.Callable[[Event], t.Any]
 
 
@@ -51,12 +81,18 @@ class Subscription(t.NamedTuple):
 
 
 class Subscribers(collections.abc.Collection):
+    """Registry of the event subscriptions.
+    Subscriptions are notified by ascending order, then by
+    event type lineage, then by order of registration.
+    """
 
-    __slots__ = ('_subscribers', 'strict')
+    __slots__ = ('_subscribers', '_index', 'strict')
 
     def __init__(self, strict: bool = True):
         self.strict = strict
-        self._subscribers: t.Dict[t.Type[Event], t.Set[Subscription]] = {}
+        self._subscribers: t.Dict[
+            t.Type[Event], PriorityChain[Subscription]] = {}
+        self._index: t.Dict[t.Type[Event], t.Tuple[Subscription, ...]] = {}
 
     def __len__(self) -> int:
         return len(self._subscribers)
@@ -67,38 +103,47 @@ class Subscribers(collections.abc.Collection):
     def __iter__(self):
         return iter(self._subscribers.items())
 
-    def get(self, event_type: t.Type[Event]) -> Subscription:
+    def get(self,
+            event_type: t.Type[Event]) -> PriorityChain[Subscription]:
         return self._subscribers.get(event_type)
 
     def add(self,
             event_type: t.Type[Event],
             subscriber: Subscriber,
-            predicates: t.Optional[Predicates] = None) -> t.NoReturn:
+            predicates: t.Optional[Predicates] = None,
+            order: int = 0) -> t.NoReturn:
         if self.strict:
             self.check_subscriber(event_type, subscriber)
-        subscribers = self._subscribers.setdefault(event_type, set())
+        subscribers = self._subscribers.setdefault(
+            event_type, PriorityChain())
         subscription = Subscription(
             subscriber=subscriber,
             predicates=predicates
         )
-        subscribers.add(subscription)
+        if any(sub == subscription for _, sub in subscribers):
+            # Already subscribed, whatever the order.
+            return
+        subscribers.add(subscription, order)
+        self._index.clear()
 
     def remove(self,
                event_type: t.Type[Event],
                subscriber: Subscriber) -> t.NoReturn:
         subscribers = self._subscribers[event_type]
-        for subscription in list(subscribers):
+        for order, subscription in list(subscribers):
             if subscription.subscriber is subscriber:
-                subscribers.remove(subscription)
+                subscribers.remove(subscription, order)
+        self._index.clear()
 
     def subscribe(self,
                   event_type: t.Type[Event],
-                  *predicates: Predicate):
+                  *predicates: Predicate,
+                  order: int = 0):
         if not predicates:
             predicates = None
 
         def register_subscriber(subscriber: Subscriber) -> Subscriber:
-            self.add(event_type, subscriber, predicates)
+            self.add(event_type, subscriber, predicates, order=order)
             return subscriber
 
         return register_subscriber
@@ -107,14 +152,37 @@ class Subscribers(collections.abc.Collection):
 
     def clear(self, event_type: t.Type[Event]):
         self._subscribers[event_type].clear()
+        self._index.clear()
+
+    def subscriptions_for(
+            self, event_type: t.Type[Event]) -> t.Tuple[Subscription, ...]:
+        """Returns the subscriptions of the event type lineage,
+        in the order of notification. The result is computed once
+        per event type, until the subscribers are modified.
+        """
+        subscriptions = self._index.get(event_type)
+        if subscriptions is None:
+            # The sort is stable: the lineage order is kept
+            # for the subscriptions of the same order.
+            ordered = sorted((
+                entry for parent in event_type.lineage()
+                if parent in self._subscribers
+                for entry in self._subscribers[parent]
+            ), key=itemgetter(0))
+            subscriptions = self._index[event_type] = tuple(
+                sub for order, sub in ordered)
+        return subscriptions
 
     def notify(self, event: Event) -> t.Any:
-        for event_type in event.lineage():
-            if event_type in self._subscribers:
-                for sub in self._subscribers[event_type]:
-                    result = sub(event)
-                    if result is not None:
-                        return result
+        for sub in self.subscriptions_for(event.__class__):
+            result = sub(event)
+            if result is not None:
+                return result
+
+    async def notify_async(self, event: Event) -> t.Any:
+        """Notifies the subscribers in a worker thread.
+        """
+        return await asyncio.to_thread(self.notify, event)
 
     @staticmethod
     def check_subscriber(event_type: t.Type[Event], sub: Subscriber):
@@ -0,0 +1,187 @@
+import typing as t
+from collections import deque
+from http import HTTPStatus
+from tempfile import SpooledTemporaryFile
+from urllib.parse import unquote_plus
+from horseman.datastructures import ContentType
+from horseman.exceptions import HTTPError
+from multifruits import Parser, extract_filename, parse_content_disposition
+
+
+class Field(t.NamedTuple):
+    name: str
+    value: str
+
+
+class FilePart(t.NamedTuple):
+    name: str
+    filename: str | None
+    content_type: str
+    file: t.BinaryIO  # spooled to disk beyond the spool size
+    size: int
+
+
+Part = t.Union[Field, FilePart]
+
+
+class MultipartStream:
+    """Incremental multipart parser.
+    Completed parts are queued as the data is fed.
+    """
+
+    def __init__(self, boundary: str, spool_size: int):
+        self.spool_size = spool_size
+        self.parts: t.Deque[Part] = deque()
+        self._parser = Parser(self, f";boundary={boundary}".encode())
+        self._headers = None
+        self._params = None
+        self._current = None
+        self._size = 0
+
+    def feed_data(self, data: bytes):
+        try:
+            self._parser.feed_data(data)
+        except ValueError:
+            raise HTTPError(
+                HTTPStatus.BAD_REQUEST, 'Unparsable multipart body.')
+
+    def on_part_begin(self):
+        self._headers = {}
+        self._size = 0
+
+    def on_header(self, field: bytes, value: bytes):
+        self._headers[field] = value
+
+    def on_headers_complete(self):
+        disposition_type, params = parse_content_disposition(
+            self._headers.get(b'Content-Disposition'))
+        if not disposition_type:
+            raise HTTPError(
+                HTTPStatus.BAD_REQUEST, 'Content-Disposition is missing.')
+        self._params = params
+        if b'Content-Type' in self._headers:
+            self._current = SpooledTemporaryFile(max_size=self.spool_size)
+        else:
+            self._current = bytearray()
+
+    def on_data(self, data: bytes):
+        if isinstance(self._current, bytearray):
+            self._current += data
+        else:
+            self._current.write(data)
+        self._size += len(data)
+
+    def on_part_complete(self):
+        name = self._params.get(b'name', b'').decode()
+        if isinstance(self._current, bytearray):
+            if self._current:
+                self.parts.append(Field(name, self._current.decode()))
+        else:
+            filename = extract_filename(self._params)
+            if not filename and not self._size:
+                # This is an empty file with no name: skipped.
+                self._current.close()
+            else:
+                self._current.seek(0)
+                self.parts.append(FilePart(
+                    name=name,
+                    filename=filename,
+                    content_type=self._headers[b'Content-Type'].decode(),
+                    file=self._current,
+                    size=self._size
+                ))
+        self._current = None
+
+
+class URLEncodedStream:
+    """Incremental `application/x-www-form-urlencoded` parser.
+    """
+
+    def __init__(self, charset: str = 'utf-8'):
+        self.charset = charset
+        self.parts: t.Deque[Part] = deque()
+        self._pending = b''
+
+    def _add(self, pair: bytes):
+        if not pair:
+            return
+        name, _, value = pair.partition(b'=')
+        try:
+            self.parts.append(Field(
+                unquote_plus(name.decode(self.charset)),
+                unquote_plus(value.decode(self.charset))
+            ))
+        except UnicodeDecodeError:
+            raise HTTPError(
+                HTTPStatus.BAD_REQUEST,
+                f'Failed to decode using charset {self.charset!r}.')
+
+    def feed_data(self, data: bytes):
+        *pairs, self._pending = (self._pending + data).split(b'&')
+        for pair in pairs:
+            self._add(pair)
+
+    def close(self):
+        self._add(self._pending)
+        self._pending = b''
+
+
+def read_chunks(body: t.BinaryIO,
+                content_length: int | None,
+                max_size: int | None,
+                chunk_size: int) -> t.Iterator[bytes]:
+    """Reads the body by chunks, checking the maximum size before
+    and while reading.
+    """
+    if max_size is not None and content_length is not None \
+       and content_length > max_size:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+
+    read = 0
+    while content_length is None or read < content_length:
+        size = chunk_size
+        if content_length is not None:
+            size = min(chunk_size, content_length - read)
+        chunk = body.read(size)
+        if not chunk:
+            break
+        read += len(chunk)
+        if max_size is not None and read > max_size:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+        yield chunk
+
+
+def stream_form(body: t.BinaryIO,
+                content_type: str | ContentType,
+                content_length: int | None = None,
+                max_size: int | None = None,
+                spool_size: int = 1024 * 1024,
+                chunk_size: int = 64 * 1024) -> t.Iterator[Part]:
+    """Yields the fields and file parts of a form body as they are
+    parsed. File parts are spooled to temporary files beyond
+    `spool_size` bytes.
+    """
+    content_type = ContentType(content_type)  # idempotent
+    if content_type.mimetype == 'multipart/form-data':
+        boundary = content_type.options.get('boundary')
+        if boundary is None:
+            raise HTTPError(
+                HTTPStatus.BAD_REQUEST, 'Missing boundary in Content-Type.')
+        parser = MultipartStream(boundary, spool_size)
+    elif content_type.mimetype == 'application/x-www-form-urlencoded':
+        parser = URLEncodedStream(
+            content_type.options.get('charset', 'utf-8'))
+    else:
+        raise HTTPError(
+            HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+            f'Unknown form content type: {content_type.mimetype!r}.')
+
+    for chunk in read_chunks(body, content_length, max_size, chunk_size):
+        parser.feed_data(chunk)
+        while parser.parts:
+            yield parser.parts.popleft()
+
+    if isinstance(parser, URLEncodedStream):
+        parser.close()
+    while parser.parts:
+        yield parser.parts.popleft()
@@ -1,27 +1,183 @@
 import abc
+import asyncio
+import contextvars
+import threading
 import typing as t
 import bisect
-from functools import reduce, wraps
-from gelidum import freeze
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, reduce, wraps
+from inspect import iscoroutinefunction
+from gelidum.collections import frozendict
 from kavallerie.response import Response
 from kavallerie.components import PriorityChain
+from kavallerie.datastructures import LRUCache
 
 
 Handler = t.Callable
 Middleware = t.Callable[[Handler, t.Optional[t.Mapping]], Handler]
 
 
+_event_loop: contextvars.ContextVar[asyncio.AbstractEventLoop] = \
+    contextvars.ContextVar('kavallerie.event_loop')
+
+# Number of worker threads of the current context blocked while
+# waiting on the event loop.
+_blocked: contextvars.ContextVar[int] = \
+    contextvars.ContextVar('kavallerie.blocked', default=0)
+
+_executors: t.Dict[int, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def executor(blocked: int) -> t.Optional[ThreadPoolExecutor]:
+    """Executor of the worker threads started while `blocked` threads
+    are waiting on the event loop, or None for the loop default.
+    A waiting thread never waits on a thread of its own executor:
+    the executors cannot all be exhausted by waiting threads.
+    """
+    if not blocked:
+        return None
+    with _executors_lock:
+        if (pool := _executors.get(blocked)) is None:
+            pool = _executors[blocked] = ThreadPoolExecutor(
+                thread_name_prefix=f'kavallerie-blocked-{blocked}')
+        return pool
+
+
+async def run_in_thread(func: t.Callable, *args, **kwargs) -> t.Any:
+    """Runs a blocking callable in a worker thread.
+    The running loop is made available to the thread, in order for
+    the callable to call back asynchronous handlers.
+    """
+    loop = asyncio.get_running_loop()
+    token = _event_loop.set(loop)
+    try:
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            executor(_blocked.get()),
+            partial(context.run, func, *args, **kwargs)
+        )
+    finally:
+        _event_loop.reset(token)
+
+
+def threaded(handler: Handler) -> Handler:
+    """Turns a blocking handler into an asynchronous one.
+    The blocking handler is kept as `blocking_handler`: blocking
+    callers run it directly, in their own thread.
+    """
+    @wraps(handler)
+    async def threaded_handler(request):
+        return await run_in_thread(handler, request)
+    threaded_handler.blocking_handler = handler
+    return threaded_handler
+
+
+def blocking(handler: Handler) -> Handler:
+    """Turns an asynchronous handler into a blocking one.
+    The returned handler must be called from a thread started
+    by `run_in_thread`.
+    """
+    if (blocking_handler := getattr(
+            handler, 'blocking_handler', None)) is not None:
+        return blocking_handler
+
+    @wraps(handler)
+    def blocking_handler(request):
+        loop = _event_loop.get()
+        token = _blocked.set(_blocked.get() + 1)
+        try:
+            # The coroutine runs in a copy of this context.
+            return asyncio.run_coroutine_threadsafe(
+                handler(request), loop).result()
+        finally:
+            _blocked.reset(token)
+    return blocking_handler
+
+
+def hybrid(handler: Handler) -> Handler:
+    """Wraps an asynchronous handler, to be called either from the
+    event loop, returning a coroutine, or from a worker thread,
+    blocking until completion.
+    """
+    blocking_handler = blocking(handler)
+
+    @wraps(handler)
+    def hybrid_handler(request):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return blocking_handler(request)
+        return handler(request)
+    return hybrid_handler
+
+
 class Pipeline(PriorityChain[Middleware]):
 
-    def wrap(self, wrapped: Handler, conf: t.Optional[t.Mapping] = None):
+    __slots__ = ('_compiled',)
+
+    # Maximum number of compiled handlers kept by `wrap`.
+    compiled_cache_size: t.ClassVar[int] = 128
+
+    _compiled: LRUCache
+
+    def __init__(self, *items: Middleware):
+        super().__init__(*items)
+        self._compiled = LRUCache(self.compiled_cache_size)
+
+    def add(self, item: Middleware, order: int = 0):
+        super().add(item, order)
+        self._compiled.clear()
+
+    def remove(self, item: Middleware, order: int):
+        super().remove(item, order)
+        self._compiled.clear()
+
+    def clear(self):
+        super().clear()
+        self._compiled.clear()
+
+    def compile(self, wrapped: Handler, conf: t.Optional[t.Mapping] = None):
         if not self._chain:
             return wrapped
 
-        return reduce(
-            lambda x, y: y(x, conf),
-            (m[1] for m in reversed(self._chain)),
-            wrapped
-        )
+        if not iscoroutinefunction(wrapped):
+            return reduce(
+                lambda x, y: y(x, conf),
+                (m[1] for m in reversed(self._chain)),
+                wrapped
+            )
+
+        # Asynchronous chain: a middleware returning a blocking handler
+        # is run in a worker thread. Its inner handler then blocks,
+        # unless it is blocking too: consecutive blocking middlewares
+        # run in the same thread.
+        handler = wrapped
+        for order, middleware in reversed(self._chain):
+            inner = hybrid(handler)
+            candidate = middleware(inner, conf)
+            if candidate is inner:
+                candidate = handler
+            elif not iscoroutinefunction(candidate):
+                candidate = threaded(candidate)
+            handler = candidate
+        return handler
+
+    def wrap(self, wrapped: Handler, conf: t.Optional[t.Mapping] = None):
+        """Returns the handler wrapped in the middlewares chain.
+        If the handler is a coroutine function, so is the result.
+        The result is cached per handler and configuration until
+        the chain is modified, in a LRU cache of
+        `compiled_cache_size` entries.
+        """
+        key = (wrapped, id(conf))
+        if (found := self._compiled.get(key)) is not None:
+            return found[1]
+        handler = self.compile(wrapped, conf)
+        # The configuration is kept alive alongside the handler,
+        # so its id cannot be reused while cached.
+        self._compiled[key] = (conf, handler)
+        return handler
 
     def __call__(self, conf: t.Optional[t.Mapping] = None):
         def wrapper(wrapped: Handler):
@@ -29,6 +185,37 @@ class Pipeline(PriorityChain[Middleware]):
         return wrapper
 
 
+def content_key(value: t.Any) -> t.Hashable:
+    """Hashable key of a configuration value, based on its content.
+    Raises a TypeError if a value cannot be hashed.
+    """
+    if isinstance(value, t.Mapping):
+        return (type(value), tuple(
+            (content_key(k), content_key(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(content_key(v) for v in value))
+    if isinstance(value, (set, frozenset)):
+        return (type(value), frozenset(content_key(v) for v in value))
+    hash(value)
+    return (type(value), value)
+
+
+_frozen_configs: LRUCache = LRUCache(maxsize=1024)
+
+
+def frozen_config(config: t.Mapping[str, t.Any]) -> frozendict:
+    """Freezes the configuration. Frozen configurations are
+    immutable: they are cached and shared by content.
+    """
+    try:
+        key = content_key(config)
+    except TypeError:
+        return frozendict(config)
+    if (frozen := _frozen_configs.get(key)) is None:
+        frozen = _frozen_configs[key] = frozendict(config)
+    return frozen
+
+
 class MiddlewareFactory(abc.ABC, Middleware):
 
     Configuration: t.ClassVar[t.Type] = None
@@ -37,7 +224,7 @@ class MiddlewareFactory(abc.ABC, Middleware):
         if self.Configuration is not None:
             self.config = self.Configuration(**kwargs)
         else:
-            self.config = freeze(kwargs)
+            self.config = frozen_config(kwargs)
         self.__post_init__()
 
     def __post_init__(self):
@@ -4,21 +4,57 @@ from kavallerie.response import Response
 from kavallerie.request import Request
 from kavallerie.pipeline import Handler
 from kavallerie.access import Filter
+from kavallerie.meta import RouteEndpoint
+from kavallerie.routes import request_route
+
+
+def flatten(filters) -> t.Iterator[Filter]:
+    for item in filters:
+        if isinstance(item, (tuple, list)):
+            yield from flatten(item)
+        else:
+            yield item
 
 
 class AccessFiltering:
+    """Runs the filters before the handler: the first filter returning
+    a response short-circuits the handler.
+    The route is matched first, to read its metadata: routes registered
+    as `public` skip the filters, `access_filters` are run after the
+    filters of the pipe. The filters of each route are computed once.
+    """
 
     filters: t.Tuple[Filter, ...]
 
     def __init__(self, *filters: t.Iterable[Filter]):
-        self.filters = tuple(filters)
+        self.filters = tuple(flatten(filters))
+        self._routes: t.Dict[
+            int, t.Tuple[RouteEndpoint, t.Tuple[Filter, ...]]] = {}
+
+    def route_filters(self, endpoint: RouteEndpoint) -> t.Tuple[Filter, ...]:
+        try:
+            return self._routes[id(endpoint)][1]
+        except KeyError:
+            pass
+        metadata = endpoint.metadata or {}
+        if metadata.get('public'):
+            filters = ()
+        else:
+            filters = self.filters + tuple(
+                flatten(metadata.get('access_filters', ())))
+        # The endpoint is kept alive: its id cannot be reused.
+        self._routes[id(endpoint)] = (endpoint, filters)
+        return filters
 
     def __call__(self,
                  handler: Handler,
                  globalconf: t.Optional[t.Mapping] = None):
 
         def access_filtering_middleware(request: Request):
-            for filter in self.filters:
+            route = request_route(request)
+            filters = self.filters if route is None \
+                else self.route_filters(route.endpoint)
+            for filter in filters:
                 if (resp := filter(handler, request)) is not None:
                     return resp
 
@@ -0,0 +1,321 @@
+import abc
+import hashlib
+import marshal
+import os
+import tempfile
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+from http import HTTPStatus
+from pathlib import Path
+from kavallerie.events import Event, Subscribers
+from kavallerie.pipeline import Handler, MiddlewareFactory
+from kavallerie.request import Request
+from kavallerie.response import Response
+from kavallerie.routes import request_route
+
+
+# Path, host, script name, query string and the values of the
+# vary headers.
+CacheKey = t.Tuple[str, str, str, str, t.Tuple[t.Optional[str], ...]]
+
+
+class CachedResponse(t.NamedTuple):
+    status: int
+    headers: t.Tuple[t.Tuple[str, str], ...]
+    body: bytes
+    expires: float
+
+    def to_response(self) -> Response:
+        return Response(self.status, self.body, self.headers)
+
+
+class CacheBackend(abc.ABC):
+    """Storage of the cached responses.
+    Keys start with the request path, allowing the invalidation of
+    all the variants of a path.
+    """
+
+    @abc.abstractmethod
+    def get(self, key: CacheKey) -> t.Optional[CachedResponse]:
+        pass
+
+    @abc.abstractmethod
+    def set(self, key: CacheKey, entry: CachedResponse):
+        pass
+
+    @abc.abstractmethod
+    def invalidate(self, path: t.Optional[str] = None):
+        """Removes the entries of the path, or all the entries.
+        """
+
+
+class MemoryBackend(CacheBackend):
+    """In-process LRU storage, safe to share between threads.
+    The keys are indexed by path, for the invalidation.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError('`maxsize` must be a positive integer.')
+        self.maxsize = maxsize
+        self.entries: t.OrderedDict[CacheKey, CachedResponse] = \
+            OrderedDict()
+        self.paths: t.Dict[str, t.Set[CacheKey]] = {}
+        self.lock = threading.Lock()
+
+    def _remove(self, key: CacheKey):
+        self.entries.pop(key, None)
+        if (keys := self.paths.get(key[0])) is not None:
+            keys.discard(key)
+            if not keys:
+                del self.paths[key[0]]
+
+    def get(self, key: CacheKey) -> t.Optional[CachedResponse]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires <= time.time():
+                self._remove(key)
+                return None
+            self.entries.move_to_end(key)
+            return entry
+
+    def set(self, key: CacheKey, entry: CachedResponse):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            self.paths.setdefault(key[0], set()).add(key)
+            while len(self.entries) > self.maxsize:
+                self._remove(next(iter(self.entries)))
+
+    def invalidate(self, path: t.Optional[str] = None):
+        with self.lock:
+            if path is None:
+                self.entries.clear()
+                self.paths.clear()
+                return
+            for key in self.paths.pop(path, ()):
+                self.entries.pop(key, None)
+
+
+class FileBackend(CacheBackend):
+    """Storage in a directory, shareable between processes.
+    Each entry is a file named after the hashes of the path and of
+    the rest of the key. The entries written by the process are
+    counted: beyond `maxsize` files, the directory is scanned and the
+    oldest entries are removed, down to 90% of `maxsize`.
+    """
+
+    def __init__(self, directory: t.Union[str, os.PathLike],
+                 maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError('`maxsize` must be a positive integer.')
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.maxsize = maxsize
+        self.lowmark = maxsize - maxsize // 10
+        self.count = sum(1 for _ in self.directory.glob('*.entry'))
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def digest(value: t.Any) -> str:
+        return hashlib.blake2b(
+            repr(value).encode(), digest_size=16).hexdigest()
+
+    def filepath(self, key: CacheKey) -> Path:
+        path, *rest = key
+        return self.directory / (
+            f'{self.digest(path)}-{self.digest(rest)}.entry')
+
+    def get(self, key: CacheKey) -> t.Optional[CachedResponse]:
+        filepath = self.filepath(key)
+        try:
+            entry = CachedResponse(*marshal.loads(filepath.read_bytes()))
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if entry.expires <= time.time():
+            self.remove(filepath)
+            return None
+        return entry
+
+    def set(self, key: CacheKey, entry: CachedResponse):
+        filepath = self.filepath(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(marshal.dumps(tuple(entry)))
+        replaced = filepath.exists()
+        os.replace(tmp, filepath)
+        if not replaced:
+            with self.lock:
+                self.count += 1
+                if self.count > self.maxsize:
+                    self.evict()
+
+    def evict(self):
+        entries = []
+        for entry in self.directory.glob('*.entry'):
+            try:
+                entries.append((entry.stat().st_mtime, entry))
+            except FileNotFoundError:
+                pass  # removed by another process.
+        if len(entries) > self.maxsize:
+            entries.sort()
+            for _, entry in entries[:len(entries) - self.lowmark]:
+                entry.unlink(missing_ok=True)
+            del entries[:len(entries) - self.lowmark]
+        self.count = len(entries)
+
+    def remove(self, filepath: Path):
+        try:
+            filepath.unlink()
+        except FileNotFoundError:
+            return
+        with self.lock:
+            self.count = max(self.count - 1, 0)
+
+    def invalidate(self, path: t.Optional[str] = None):
+        pattern = '*.entry' if path is None \
+            else f'{self.digest(path)}-*.entry'
+        for entry in self.directory.glob(pattern):
+            self.remove(entry)
+
+
+class ResponseCache(MiddlewareFactory):
+    """Caches the responses of the routes flagged with the `cache`
+    metadata. The metadata is either `True` or a TTL in seconds.
+    Entries are keyed by path, host, script name, query string and
+    the values of the `vary` request headers. Only the 200 responses
+    of GET requests with a bytes or string body are stored. They are
+    served to GET and HEAD requests.
+    Requests carrying credentials, an `Authorization` header or the
+    session cookie, are neither served nor stored, unless the route
+    is flagged with the `private_key` metadata.
+    """
+
+    class Configuration(t.NamedTuple):
+        backend: t.Optional[CacheBackend] = None
+        ttl: float = 60.0
+        maxsize: int = 1024
+        vary: t.Tuple[str, ...] = ()
+        metadata_key: str = 'cache'
+        private_key: str = 'cache_private'
+        session_cookie: str = 'sid'
+
+    def __post_init__(self):
+        self.backend = (
+            self.config.backend if self.config.backend is not None
+            else MemoryBackend(self.config.maxsize)
+        )
+        self.vary_keys = tuple(
+            'HTTP_' + header.upper().replace('-', '_')
+            for header in self.config.vary
+        )
+        self.vary_names = frozenset(
+            header.lower() for header in self.config.vary)
+
+    def ttl(self, request: Request) -> t.Optional[float]:
+        route = request_route(request)
+        if route is None or not route.endpoint.metadata:
+            return None
+        metadata = route.endpoint.metadata
+        flag = metadata.get(self.config.metadata_key)
+        if not flag:
+            return None
+        if not metadata.get(self.config.private_key) \
+           and self.has_credentials(request):
+            return None
+        if flag is True:
+            return self.config.ttl
+        return float(flag)
+
+    def has_credentials(self, request: Request) -> bool:
+        if request.get('HTTP_AUTHORIZATION'):
+            return True
+        return bool(request.get('HTTP_COOKIE')) and \
+            self.config.session_cookie in request.cookies
+
+    def key(self, request: Request) -> CacheKey:
+        return (
+            request.path,
+            request.get('HTTP_HOST', ''),
+            request.get('SCRIPT_NAME', ''),
+            request.get('QUERY_STRING', ''),
+            tuple(request.get(name) for name in self.vary_keys)
+        )
+
+    def storable(self, response: Response) -> bool:
+        if response.status != HTTPStatus.OK \
+           or not isinstance(response.body, (bytes, str)) \
+           or any(name == 'Set-Cookie'
+                  for name, value in response.headers.items()):
+            return False
+        cache_control = response.headers.get('Cache-Control', '')
+        if 'no-store' in cache_control or 'private' in cache_control:
+            return False
+        vary = response.headers.get('Vary')
+        if vary is not None:
+            # Variants on headers outside of the key are not cached.
+            return all(
+                value.strip().lower() in self.vary_names
+                for value in vary.split(',')
+            )
+        return True
+
+    def store(self, key: CacheKey, response: Response, ttl: float):
+        body = response.body
+        if isinstance(body, str):
+            body = response.body = body.encode()
+        self.backend.set(key, CachedResponse(
+            status=int(response.status),
+            headers=tuple(response.headers.items()),
+            body=body,
+            expires=time.time() + ttl
+        ))
+
+    def invalidate(self, path: t.Optional[str] = None):
+        self.backend.invalidate(path)
+
+    def invalidate_on(self,
+                      subscribers: Subscribers,
+                      event_type: t.Type[Event],
+                      paths: t.Optional[
+                          t.Callable[[Event], t.Iterable[str]]] = None):
+        """Subscribes the invalidation to an event type.
+        `paths` returns the paths to invalidate for an event. Without
+        it, the whole cache is invalidated.
+        """
+        def invalidate_cache(event):
+            if paths is None:
+                self.invalidate()
+            else:
+                for path in paths(event):
+                    self.invalidate(path)
+
+        subscribers.subscribe(event_type)(invalidate_cache)
+        return invalidate_cache
+
+    def __call__(self,
+                 handler: Handler,
+                 globalconf: t.Optional[t.Mapping] = None):
+
+        def cache_middleware(request):
+            if request.method not in ('GET', 'HEAD'):
+                return handler(request)
+            ttl = self.ttl(request)
+            if ttl is None:
+                return handler(request)
+
+            key = self.key(request)
+            if (entry := self.backend.get(key)) is not None:
+                return entry.to_response()
+
+            response = handler(request)
+            if request.method == 'GET' and isinstance(response, Response) \
+               and self.storable(response):
+                self.store(key, response, ttl)
+            return response
+
+        return cache_middleware
@@ -0,0 +1,121 @@
+import typing as t
+import zlib
+from http import HTTPStatus
+from horseman.response import BODYLESS
+from kavallerie.pipeline import Handler, MiddlewareFactory
+from kavallerie.response import Response, add_vary
+
+
+# Window bits of the zlib compressor, per content-coding.
+# HTTP `deflate` is the zlib format, `gzip` adds the gzip wrapper.
+WBITS = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS,
+}
+
+
+COMPRESSED_TYPES = frozenset((
+    'image/*',
+    'video/*',
+    'audio/*',
+    'font/woff',
+    'font/woff2',
+    'application/gzip',
+    'application/x-gzip',
+    'application/zip',
+    'application/x-bzip2',
+    'application/x-xz',
+    'application/x-7z-compressed',
+    'application/x-rar-compressed',
+    'application/zstd',
+))
+
+
+def compress_iterable(body: t.Iterable[bytes],
+                      encoding: str, level: int) -> t.Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, WBITS[encoding])
+    try:
+        for chunk in body:
+            if data := compressor.compress(chunk):
+                yield data
+        yield compressor.flush()
+    finally:
+        if (closer := getattr(body, 'close', None)) is not None:
+            closer()
+
+
+class Compression(MiddlewareFactory):
+    """Compresses the responses using the preferred encoding of the
+    `Accept-Encoding` request header.
+    Bodies smaller than `minimum_size` are sent as is. Iterable
+    bodies are compressed chunk by chunk, as they are sent.
+    Content types of `excluded`, such as images, are not compressed.
+    Entries ending in `/*` exclude a whole type.
+    """
+
+    class Configuration(t.NamedTuple):
+        level: int = 6
+        minimum_size: int = 500
+        encodings: t.Tuple[str, ...] = ('gzip', 'deflate')
+        excluded: t.FrozenSet[str] = COMPRESSED_TYPES
+
+    def __post_init__(self):
+        for encoding in self.config.encodings:
+            if encoding not in WBITS:
+                raise ValueError(f'Unsupported encoding: {encoding!r}.')
+
+    def compressible(self, response: Response) -> bool:
+        if response.status in BODYLESS \
+           or response.status == HTTPStatus.PARTIAL_CONTENT \
+           or response.body is None \
+           or 'Content-Encoding' in response.headers \
+           or 'no-transform' in response.headers.get('Cache-Control', ''):
+            return False
+        mimetype = response.headers.get('Content-Type', '').partition(
+            ';')[0].strip().lower()
+        return not (
+            mimetype in self.config.excluded
+            or f"{mimetype.partition('/')[0]}/*" in self.config.excluded
+        )
+
+    def compress(self, response: Response, encoding: str):
+        body = response.body
+        if isinstance(body, str):
+            body = body.encode()
+        if isinstance(body, bytes):
+            if len(body) < self.config.minimum_size:
+                return
+            compressor = zlib.compressobj(
+                self.config.level, zlib.DEFLATED, WBITS[encoding])
+            response.body = compressor.compress(body) + compressor.flush()
+            response.headers['Content-Length'] = str(len(response.body))
+        else:
+            length = response.headers.get('Content-Length')
+            if length is not None and length.isdigit() \
+               and int(length) < self.config.minimum_size:
+                return
+            response.body = compress_iterable(
+                body, encoding, self.config.level)
+            response.headers.popall('Content-Length', None)
+        response.headers['Content-Encoding'] = encoding
+        etag = response.headers.get('ETag')
+        if etag is not None and not etag.startswith('W/'):
+            # The representation is no longer byte-identical.
+            response.headers['ETag'] = f'W/{etag}'
+
+    def __call__(self,
+                 handler: Handler,
+                 globalconf: t.Optional[t.Mapping] = None):
+
+        def compression_middleware(request):
+            response = handler(request)
+            if not isinstance(response, Response) \
+               or not self.compressible(response):
+                return response
+            add_vary(response, 'Accept-Encoding')
+            encoding = request.accept_encoding.best(*self.config.encodings)
+            if encoding is not None:
+                self.compress(response, encoding)
+            return response
+
+        return compression_middleware
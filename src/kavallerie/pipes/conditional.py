@@ -0,0 +1,74 @@
+import hashlib
+import typing as t
+from datetime import datetime
+from http import HTTPStatus
+from email.utils import formatdate
+from kavallerie.pipeline import Handler, MiddlewareFactory
+from kavallerie.request import Request
+from kavallerie.response import Response, http_timestamp, is_not_modified
+
+
+class Validators(t.NamedTuple):
+    etag: t.Optional[str] = None
+    last_modified: t.Optional[t.Union[datetime, float]] = None
+
+    @property
+    def headers(self) -> t.Dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers['ETag'] = self.etag
+        if self.last_modified is not None:
+            headers['Last-Modified'] = formatdate(
+                http_timestamp(self.last_modified), usegmt=True)
+        return headers
+
+
+Validator = t.Callable[[Request], t.Optional[Validators]]
+
+
+def body_etag(body: t.Union[str, bytes]) -> str:
+    if isinstance(body, str):
+        body = body.encode()
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+class ConditionalGET(MiddlewareFactory):
+    """Answers `If-None-Match` and `If-Modified-Since` requests.
+    The `validator` is called before the handler: if the validators
+    it returns match, the handler is not called at all.
+    Otherwise, the response itself is checked, after getting an ETag
+    computed from its body if `compute_etag` is set.
+    """
+
+    class Configuration(t.NamedTuple):
+        validator: t.Optional[Validator] = None
+        compute_etag: bool = False
+
+    def __call__(self,
+                 handler: Handler,
+                 globalconf: t.Optional[t.Mapping] = None):
+
+        def conditional_middleware(request):
+            if request.method not in ('GET', 'HEAD'):
+                return handler(request)
+
+            if self.config.validator is not None:
+                validators = self.config.validator(request)
+                if validators is not None and is_not_modified(
+                        request, *validators):
+                    return Response(
+                        HTTPStatus.NOT_MODIFIED,
+                        headers=validators.headers
+                    )
+
+            response = handler(request)
+            if not isinstance(response, Response):
+                return response
+            if self.config.compute_etag \
+               and response.status == HTTPStatus.OK \
+               and 'ETag' not in response.headers \
+               and isinstance(response.body, (str, bytes)):
+                response.headers['ETag'] = body_etag(response.body)
+            return response.conditional(request)
+
+        return conditional_middleware
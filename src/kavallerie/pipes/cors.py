@@ -1,23 +1,35 @@
 import logging
+import typing as t
 from kavallerie.pipeline import Handler
-from kavallerie.response import Response, Headers
+from kavallerie.response import Response, Headers, add_vary
 
 
 Logger = logging.getLogger(__name__)
 
 
-def CORS(handler: Handler):
+def CORS(handler: Handler, globalconf: t.Optional[t.Mapping] = None):
     def cors_policy_handler(request):
-        if request.cors_policy is None or request.method != 'OPTIONS':
+        if request.cors_policy is None:
             return handler(request)
 
+        origin = request.get('HTTP_ORIGIN')
+        if request.method != 'OPTIONS':
+            response = handler(request)
+            if origin is not None:
+                for name, value in request.cors_policy.headers(
+                        origin).items():
+                    if name == 'Vary':
+                        add_vary(response, value)
+                    else:
+                        response.headers[name] = value
+            return response
+
         # We intercept the preflight.
         # If a route was possible registered for OPTIONS,
         # this will override it.
         Logger.debug('Cors policy found: crafting preflight response.')
-        origin = request.get('ORIGIN')
-        acr_method = request.get('ACCESS_CONTROL_REQUEST_METHOD')
-        acr_headers = request.get('ACCESS_CONTROL_REQUEST_HEADERS')
+        acr_method = request.get('HTTP_ACCESS_CONTROL_REQUEST_METHOD')
+        acr_headers = request.get('HTTP_ACCESS_CONTROL_REQUEST_HEADERS')
         headers = request.cors_policy.preflight(
             origin=origin,
             acr_method=acr_method,
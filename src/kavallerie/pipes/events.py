@@ -0,0 +1,107 @@
+import typing as t
+import logging
+from collections import defaultdict
+from transaction.interfaces import NoTransaction
+from kavallerie.events import Batch, Event, Subscribers
+from kavallerie.pipeline import Handler
+
+
+class DeferredEvents:
+    """Events queued during the request, to be notified
+    once the work is committed.
+    Each event is notified to the subscribers of its type. Then, for
+    each type, a single `Batch[type]` event holds all the events.
+    """
+
+    def __init__(self,
+                 subscribers: Subscribers,
+                 utilities: t.Optional[t.Mapping[str, t.Any]] = None):
+        self.subscribers = subscribers
+        self.utilities = utilities
+        self.events: t.List[Event] = []
+        self.joined = False
+
+    def __len__(self):
+        return len(self.events)
+
+    def add(self, event: Event):
+        if not self.joined and self.utilities is not None:
+            manager = self.utilities.get('transaction_manager')
+            if manager is not None:
+                self.join(manager)
+        self.events.append(event)
+
+    def join(self, manager):
+        """Binds the events to the current transaction: they are
+        notified after a successful commit only.
+        """
+        try:
+            txn = manager.get()
+        except NoTransaction:
+            return
+        txn.addAfterCommitHook(self.after_commit)
+        self.joined = True
+
+    def after_commit(self, status: bool):
+        if not status:
+            self.clear()
+            return
+        try:
+            self.flush()
+        except Exception:
+            # The transaction is already committed: a failing
+            # subscriber must not leave it in an inconsistent state.
+            logging.exception(
+                f"Failed in after commit hook for {self.flush!r}")
+
+    def clear(self):
+        self.events.clear()
+
+    def flush(self):
+        events, self.events = self.events, []
+        batches = defaultdict(list)
+        for event in events:
+            self.subscribers.notify(event)
+            batches[event.__class__].append(event)
+        for event_type, batch in batches.items():
+            self.subscribers.notify(Batch[event_type](batch))
+
+
+def Deferred(subscribers: Subscribers | None = None):
+    """Pipe providing a `DeferredEvents` as `request.utilities['events']`.
+    Events added while a transaction is running, such as inside the
+    `Transaction` pipe, are notified after its successful commit:
+    they are dropped if it is aborted or doomed.
+    Without transaction, they are notified if the response status is
+    below 400 and dropped otherwise, or on error.
+    """
+
+    def deferred_events_pipe(
+            handler: Handler,
+            globalconf: t.Optional[t.Mapping] = None):
+
+        def deferred_events_middleware(request):
+            events = DeferredEvents(
+                subscribers if subscribers is not None
+                else request.app.subscribers,
+                request.utilities
+            )
+            request.utilities['events'] = events
+            try:
+                response = handler(request)
+            except Exception:
+                if not events.joined:
+                    events.clear()
+                raise
+            finally:
+                del request.utilities['events']
+
+            if not events.joined:
+                if response.status < 400:
+                    events.flush()
+                else:
+                    events.clear()
+            return response
+
+        return deferred_events_middleware
+    return deferred_events_pipe
@@ -1,9 +1,60 @@
 import itsdangerous
+import time
 import typing as t
-import datetime
+from functools import partial
 from http_session.meta import Store
 from http_session.cookie import SameSite, HashAlgorithm, SignedCookieManager
+from http_session.session import Session
 from kavallerie.pipeline import Handler, MiddlewareFactory
+from kavallerie.request import Request
+
+
+class LazySession(t.Mapping[str, t.Any]):
+    """Proxy of the session, loaded on first use: the cookie is
+    verified and the store is read only if the session is accessed.
+    """
+
+    __slots__ = ('_loader', '_session')
+
+    def __init__(self, loader: t.Callable[[], Session]):
+        self._loader = loader
+        self._session = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._session is not None
+
+    @property
+    def session(self) -> Session:
+        if self._session is None:
+            self._session = self._loader()
+        return self._session
+
+    def __getattr__(self, name: str):
+        return getattr(self.session, name)
+
+    def __getitem__(self, key: str):
+        return self.session[key]
+
+    def __setitem__(self, key: str, value: t.Any):
+        self.session[key] = value
+
+    def __delitem__(self, key: str):
+        del self.session[key]
+
+    def __contains__(self, key: str):
+        return key in self.session
+
+    def __iter__(self):
+        return iter(self.session)
+
+    def __len__(self):
+        return len(self.session)
+
+    def __repr__(self):
+        if self._session is None:
+            return '<LazySession (not loaded)>'
+        return repr(self._session)
 
 
 class HTTPSession(MiddlewareFactory):
@@ -34,6 +85,31 @@ class HTTPSession(MiddlewareFactory):
             cookie_name=self.config.cookie_name,
         )
 
+    def load(self, request: Request) -> Session:
+        new = True
+        if (sig := request.cookies.get(self.manager.cookie_name)):
+            try:
+                sid = str(self.manager.verify_id(sig), 'utf-8')
+                new = False
+            except itsdangerous.exc.SignatureExpired:
+                # Session expired. We generate a new one.
+                pass
+            except itsdangerous.exc.BadTimeSignature:
+                # Discrepancy in time signature.
+                # Invalid, generate a new one
+                pass
+
+        if new is True:
+            sid = self.manager.generate_id()
+
+        session = self.manager.session_factory(
+            sid, self.manager.store, new=new
+        )
+        created = int(time.time())
+        session.data['created'] = created
+        session.data['expires'] = created + self.config.TTL
+        return session
+
     def __call__(self,
                  handler: Handler,
                  globalconf: t.Optional[t.Mapping] = None):
@@ -41,37 +117,17 @@ class HTTPSession(MiddlewareFactory):
         def http_session_middleware(request):
             session = request.utilities.get('http_session')
             if session is None:
-                new = True
-                if (sig := request.cookies.get(self.manager.cookie_name)):
-                    try:
-                        sid = str(self.manager.verify_id(sig), 'utf-8')
-                        new = False
-                    except itsdangerous.exc.SignatureExpired:
-                        # Session expired. We generate a new one.
-                        pass
-                    except itsdangerous.exc.BadTimeSignature:
-                        # Discrepancy in time signature.
-                        # Invalid, generate a new one
-                        pass
-
-                if new is True:
-                    sid = self.manager.generate_id()
-
-                session = self.manager.session_factory(
-                    sid, self.manager.store, new=new
-                )
-                creation = datetime.datetime.now()
-                session.data['created'] = int(
-                    datetime.datetime.timestamp(creation)
-                )
-                session.data['expires'] = int(datetime.datetime.timestamp(
-                    creation +
-                    datetime.timedelta(seconds=self.config.TTL)
-                ))
+                session = LazySession(partial(self.load, request))
                 request.utilities['http_session'] = session
 
             response = handler(request)
 
+            if isinstance(session, LazySession):
+                if not session.loaded and not self.config.save_new_empty:
+                    # Untouched session: nothing to persist or refresh.
+                    return response
+                session = session.session
+
             if not session.modified and (
                     session.new and self.config.save_new_empty):
                 session.save()
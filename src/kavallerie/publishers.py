@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import queue
+import threading
+import typing as t
+from kavallerie.events import Event, Subscribers
+
+
+logger = logging.getLogger('kavallerie.publishers')
+
+_STOP = object()
+
+
+class ThreadedPublisher:
+    """Notifies the subscribers in background threads.
+    The backlog is bounded: `publish` blocks when it is full, for at
+    most `timeout` seconds, then raises `queue.Full`.
+    The results of the subscribers are discarded and their errors
+    are logged.
+    """
+
+    subscribers: Subscribers
+    timeout: float | None
+
+    def __init__(self,
+                 subscribers: Subscribers,
+                 maxsize: int = 1024,
+                 workers: int = 1,
+                 timeout: float | None = None):
+        self.subscribers = subscribers
+        self.timeout = timeout
+        self.queue = queue.Queue(maxsize)
+        self._closed = False
+        # Guards the check of `_closed` and the put: no event is
+        # queued after the stop sentinels.
+        self._lock = threading.Lock()
+        self._workers = tuple(
+            threading.Thread(
+                target=self._work,
+                name=f'kavallerie-publisher-{idx}',
+                daemon=True
+            ) for idx in range(workers)
+        )
+        for worker in self._workers:
+            worker.start()
+
+    def _work(self):
+        while True:
+            event = self.queue.get()
+            try:
+                if event is _STOP:
+                    return
+                self.subscribers.notify(event)
+            except Exception:
+                logger.exception(f'Background notification of {event!r}.')
+            finally:
+                self.queue.task_done()
+
+    def publish(self, event: Event) -> None:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('Publisher is closed.')
+            self.queue.put(event, timeout=self.timeout)
+
+    def drain(self) -> None:
+        """Blocks until all the published events are notified.
+        """
+        self.queue.join()
+
+    def close(self) -> None:
+        """Notifies the remaining events and stops the workers.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            for worker in self._workers:
+                self.queue.put(_STOP)
+        for worker in self._workers:
+            worker.join()
+
+
+class AsyncPublisher:
+    """Notifies the subscribers from asyncio tasks.
+    The subscribers are run in worker threads, not to block the loop.
+    The backlog is bounded: `publish` waits when it is full.
+    The results of the subscribers are discarded and their errors
+    are logged.
+    """
+
+    subscribers: Subscribers
+
+    def __init__(self,
+                 subscribers: Subscribers,
+                 maxsize: int = 1024,
+                 workers: int = 1):
+        self.subscribers = subscribers
+        self.workers = workers
+        self.queue = asyncio.Queue(maxsize)
+        self._tasks: t.List[asyncio.Task] = []
+
+    async def _work(self):
+        while True:
+            event = await self.queue.get()
+            try:
+                await self.subscribers.notify_async(event)
+            except Exception:
+                logger.exception(f'Background notification of {event!r}.')
+            finally:
+                self.queue.task_done()
+
+    async def publish(self, event: Event) -> None:
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._work())
+                for idx in range(self.workers)
+            ]
+        await self.queue.put(event)
+
+    async def drain(self) -> None:
+        """Waits until all the published events are notified.
+        """
+        await self.queue.join()
+
+    async def close(self) -> None:
+        """Notifies the remaining events and stops the workers.
+        """
+        await self.drain()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
@@ -4,13 +4,17 @@ import urllib.parse
 import horseman.parsers
 import horseman.types
 import horseman.datastructures
+from http import HTTPStatus
+from tempfile import SpooledTemporaryFile
 from types import SimpleNamespace
 from authsources.protocols import RequestProtocol
-from horseman.environ import WSGIEnvironWrapper
+from horseman.environ import WSGIEnvironWrapper, immutable_cached_property
+from horseman.exceptions import HTTPError
 from horseman.mapping import Node
 from http_session.session import Session
-from kavallerie import meta
+from kavallerie import meta, parsers
 from kavallerie.cors import CORSPolicy
+from kavallerie.datastructures import Accept
 
 
 class FlagsField(SimpleNamespace):
@@ -31,6 +35,14 @@ class Request(WSGIEnvironWrapper, meta.Request):
         'flags',
     )
 
+    # Lazy attributes computed when the request is created.
+    # See `prefetch`.
+    eager_attributes: t.ClassVar[t.Tuple[str, ...]] = ()
+
+    # Limits of `stream_form` and `AsyncRequest.read`, in bytes.
+    max_body_size: t.ClassVar[int | None] = None
+    spool_size: t.ClassVar[int] = 1024 * 1024
+
     # arguments
     app: meta.Application | None
     flags: FlagsField
@@ -54,11 +66,116 @@ class Request(WSGIEnvironWrapper, meta.Request):
         self.cors_policy = cors_policy
         self.flags = FlagsField()
         WSGIEnvironWrapper.__init__(self, environ)
+        if self.eager_attributes:
+            self.prefetch(*self.eager_attributes)
+
+    def prefetch(self, *names: str):
+        """Computes the given lazy attributes, such as `cookies`,
+        `query` or `accept`. Lazy attributes are computed once.
+        """
+        for name in names:
+            getattr(self, name)
 
     @property
     def headers(self):
         # Respecting the RequestProtocol
         return self._environ
 
+    def stream_form(self,
+                    max_size: int | None = None,
+                    spool_size: int | None = None
+                    ) -> t.Iterator[parsers.Part]:
+        """Yields the form fields and files as the body is read.
+        Unlike `data`, the body is never loaded at once in memory.
+        """
+        content_length = self._environ.get('CONTENT_LENGTH')
+        return parsers.stream_form(
+            self.body,
+            self.content_type,
+            content_length=int(content_length) if content_length else None,
+            max_size=max_size if max_size is not None
+            else self.max_body_size,
+            spool_size=spool_size if spool_size is not None
+            else self.spool_size,
+        )
+
+    @immutable_cached_property
+    def accept(self) -> Accept:
+        return Accept.from_string(self._environ.get('HTTP_ACCEPT', ''))
+
+    @immutable_cached_property
+    def accept_encoding(self) -> Accept:
+        return Accept.from_string(
+            self._environ.get('HTTP_ACCEPT_ENCODING', ''))
+
+    @immutable_cached_property
+    def accept_language(self) -> Accept:
+        return Accept.from_string(
+            self._environ.get('HTTP_ACCEPT_LANGUAGE', ''))
+
+
+class AsyncRequest(Request):
+    """Request of an ASGI application.
+    The body is received from the ASGI `receive` callable and must be
+    awaited, using `read` or `get_data`, before accessing `body`
+    or `data`. `Application.resolve_async` reads it before running
+    the middlewares.
+    """
+
+    __slots__ = ('receive', '_received')
+
+    receive: t.Callable[[], t.Awaitable[t.Mapping[str, t.Any]]]
+
+    def __init__(self,
+                 app: meta.Application | None,
+                 environ: horseman.types.Environ,
+                 receive: t.Callable[[], t.Awaitable[t.Mapping]],
+                 **kwargs):
+        super().__init__(app, environ, **kwargs)
+        self.receive = receive
+        self._received = False
+
+    async def read(self) -> t.BinaryIO:
+        """Receives the body and returns it, as `wsgi.input`.
+        `max_body_size` is checked against the `Content-Length` header
+        and while receiving. The body is spooled to disk beyond
+        `spool_size` bytes.
+        """
+        if not self._received:
+            content_length = self._environ.get('CONTENT_LENGTH')
+            if self.max_body_size is not None and content_length \
+               and int(content_length) > self.max_body_size:
+                raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+
+            stream = SpooledTemporaryFile(max_size=self.spool_size)
+            size = 0
+            try:
+                while True:
+                    message = await self.receive()
+                    if message['type'] == 'http.disconnect':
+                        raise ConnectionError(
+                            'Client disconnected before the end '
+                            'of the body.')
+                    chunk = message.get('body', b'')
+                    size += len(chunk)
+                    if self.max_body_size is not None \
+                       and size > self.max_body_size:
+                        raise HTTPError(
+                            HTTPStatus.REQUEST_ENTITY_TOO_LARGE)
+                    stream.write(chunk)
+                    if not message.get('more_body', False):
+                        break
+            except BaseException:
+                stream.close()
+                raise
+            stream.seek(0)
+            self._environ['wsgi.input'] = stream
+            self._received = True
+        return self._environ['wsgi.input']
+
+    async def get_data(self) -> horseman.parsers.Data:
+        await self.read()
+        return self.data
+
 
-__all__ = ['Request']
+__all__ = ['Request', 'AsyncRequest']
@@ -1,7 +1,13 @@
+import mmap
+import mimetypes
+import os
+import re
 import orjson
+from datetime import datetime
+from email.utils import formatdate, parsedate_to_datetime
 from http import HTTPStatus
-from typing import Iterable, Any
-from horseman.response import Response as BaseResponse, Headers
+from typing import BinaryIO, Callable, Iterable, Iterator, Any
+from horseman.response import Response as BaseResponse, Headers, BODYLESS
 from horseman.types import Environ, HTTPCode, StartResponse
 
 
@@ -17,6 +23,179 @@ REDIRECT = frozenset((
 ))
 
 
+class FileBody:
+    """Region of an open binary file, used as a response body.
+    It is file-like, to be handed to `wsgi.file_wrapper`, and
+    iterable, using memory-mapped reads.
+    """
+
+    __slots__ = ('file', 'offset', 'length', 'chunk_size', '_remaining')
+
+    def __init__(self, file: BinaryIO, offset: int, length: int,
+                 chunk_size: int = 64 * 1024):
+        self.file = file
+        self.offset = offset
+        self.length = length
+        self.chunk_size = chunk_size
+        self._remaining = length
+        file.seek(offset)  # the server sends from the current position.
+
+    def fileno(self) -> int:
+        return self.file.fileno()
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self.file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def __iter__(self) -> Iterator[bytes]:
+        if not self.length:
+            return
+        try:
+            mapped = mmap.mmap(
+                self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Not a mappable file: plain chunked reads.
+            while chunk := self.read(self.chunk_size):
+                yield chunk
+            return
+        with mapped:
+            end = self.offset + self.length
+            for start in range(self.offset, end, self.chunk_size):
+                yield mapped[start:min(start + self.chunk_size, end)]
+
+    def close(self):
+        self.file.close()
+
+
+class ResponseFile:
+    """File-like view of a file response, for `wsgi.file_wrapper`.
+    Closing it closes the response, running its finishers.
+    """
+
+    __slots__ = ('response',)
+
+    def __init__(self, response: 'Response'):
+        self.response = response
+
+    def fileno(self) -> int:
+        return self.response.body.fileno()
+
+    def read(self, size: int = -1) -> bytes:
+        return self.response.body.read(size)
+
+    def close(self):
+        self.response.close()
+
+
+def byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parses a single `bytes` range against the resource size.
+    Returns the `(offset, length)` of the range or None if the
+    header is not usable, in which case the full resource is sent.
+    Raises a ValueError if the range is not satisfiable.
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip() != 'bytes' or ',' in spec:
+        return None  # multiple ranges are not supported.
+    first, sep, last = (value.strip() for value in spec.partition('-'))
+    if not sep or not (first or last) or not all(
+            value.isdecimal() for value in (first, last) if value):
+        return None  # malformed ranges are ignored.
+    if not first:
+        # Suffix range: the last bytes of the resource.
+        length = min(int(last), size)
+        if not length:
+            raise ValueError('Unsatisfiable range.')
+        return size - length, length
+    start = int(first)
+    if last and int(last) < start:
+        return None  # invalid ranges are ignored, as per RFC 7233.
+    if start >= size:
+        raise ValueError('Unsatisfiable range.')
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end - start + 1
+
+
+ETAG = re.compile(r'(W/)?"[^"]*"')
+
+NOT_MODIFIED_DROPPED = (
+    'Content-Length',
+    'Content-Type',
+    'Content-Range',
+    'Content-Encoding',
+    'Transfer-Encoding',
+)
+
+
+def etag_matches(etag: str, header: str, weak: bool = True) -> bool:
+    """Checks an entity-tag against an `If-None-Match` or `If-Match`
+    header value. Weak comparison ignores the `W/` prefix, strong
+    comparison never matches weak tags.
+    """
+    if header.strip() == '*':
+        return True
+    if etag.startswith('W/'):
+        if not weak:
+            return False
+        etag = etag[2:]
+    for match in ETAG.finditer(header):
+        candidate = match.group(0)
+        if match.group(1):
+            if not weak:
+                continue
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def http_timestamp(value: str | datetime | float | None) -> int | None:
+    """Timestamp, in seconds, of an HTTP-date, datetime or timestamp.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if isinstance(value, datetime):
+        value = value.timestamp()
+    return int(value)
+
+
+def is_not_modified(environ: Environ,
+                    etag: str | None = None,
+                    last_modified: str | datetime | float | None = None
+                    ) -> bool:
+    """Evaluates the `If-None-Match` and `If-Modified-Since`
+    preconditions against the validators of the resource.
+    `If-None-Match` takes precedence, as per RFC 7232.
+    """
+    if environ.get('REQUEST_METHOD') not in ('GET', 'HEAD'):
+        return False
+    if (header := environ.get('HTTP_IF_NONE_MATCH')) is not None:
+        return etag is not None and etag_matches(etag, header)
+    if (header := environ.get('HTTP_IF_MODIFIED_SINCE')) is not None:
+        modified = http_timestamp(last_modified)
+        since = http_timestamp(header)
+        return None not in (modified, since) and modified <= since
+    return False
+
+
+def add_vary(response: 'Response', header: str):
+    """Adds a header name to the `Vary` header of the response.
+    """
+    vary = response.headers.get('Vary')
+    if vary is None:
+        response.headers['Vary'] = header
+    elif vary.strip() != '*' and header.lower() not in (
+            value.strip().lower() for value in vary.split(',')):
+        response.headers['Vary'] = f'{vary}, {header}'
+
+
 class Response(BaseResponse):
 
     @classmethod
@@ -42,10 +221,124 @@ class Response(BaseResponse):
                 f"attachment;filename={filename}")
         return cls(200, body, headers)
 
+    @classmethod
+    def from_fd(cls, fd: int | BinaryIO, environ: Environ | None = None,
+                filename: str | None = None,
+                content_type: str | None = None,
+                headers: Headers | None = None,
+                chunk_size: int = 64 * 1024):
+        """Creates a response sending the content of an open file,
+        given as a descriptor or a binary file object.
+        The file is closed with the response.
+        If `environ` is given, a `Range` header is honored.
+        """
+        file = open(fd, 'rb') if isinstance(fd, int) else fd
+        try:
+            stat = os.fstat(file.fileno())
+            etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+            headers = Headers(headers or ())
+            headers['Content-Type'] = (
+                content_type or headers.get('Content-Type')
+                or 'application/octet-stream'
+            )
+            headers['ETag'] = etag
+            headers['Last-Modified'] = formatdate(
+                stat.st_mtime, usegmt=True)
+            headers['Accept-Ranges'] = 'bytes'
+            if filename is not None \
+               and 'Content-Disposition' not in headers:
+                headers['Content-Disposition'] = (
+                    f'attachment;filename={filename}')
+
+            status, offset, length = 200, 0, stat.st_size
+            if environ is not None and (
+                    header := environ.get('HTTP_RANGE')):
+                if_range = environ.get('HTTP_IF_RANGE')
+                if if_range is None or if_range == etag:
+                    try:
+                        region = byte_range(header, stat.st_size)
+                    except ValueError:
+                        file.close()
+                        headers['Content-Range'] = \
+                            f'bytes */{stat.st_size}'
+                        return cls(
+                            HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+                            headers=headers
+                        )
+                    if region is not None:
+                        status = HTTPStatus.PARTIAL_CONTENT
+                        offset, length = region
+                        headers['Content-Range'] = (
+                            f'bytes {offset}-{offset + length - 1}'
+                            f'/{stat.st_size}'
+                        )
+            headers['Content-Length'] = str(length)
+            body = FileBody(file, offset, length, chunk_size)
+        except BaseException:
+            file.close()
+            raise
+        return cls(status, body, headers)
+
+    @classmethod
+    def from_path(cls, path: str | os.PathLike,
+                  environ: Environ | None = None,
+                  filename: str | None = None,
+                  content_type: str | None = None,
+                  headers: Headers | None = None,
+                  chunk_size: int = 64 * 1024):
+        """Creates a response sending the file at `path`.
+        See `from_fd`.
+        """
+        if content_type is None:
+            content_type, _ = mimetypes.guess_type(os.fspath(path))
+        return cls.from_fd(
+            open(path, 'rb'), environ, filename=filename,
+            content_type=content_type, headers=headers,
+            chunk_size=chunk_size
+        )
+
+    def conditional(self, environ: Environ) -> 'Response':
+        """Turns a successful response into a `304 Not Modified`
+        if its `ETag` or `Last-Modified` headers satisfy the request
+        preconditions. The body is dropped, headers such as cookies
+        and finishers are kept.
+        """
+        if self.status != HTTPStatus.OK or not is_not_modified(
+                environ,
+                self.headers.get('ETag'),
+                self.headers.get('Last-Modified')):
+            return self
+        if isinstance(self.body, FileBody):
+            self.body.close()
+        self.status = HTTPStatus.NOT_MODIFIED
+        self.body = None
+        for name in NOT_MODIFIED_DROPPED:
+            self.headers.popall(name, None)
+        return self
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            if isinstance(self.body, FileBody):
+                self.body.close()
+
+    def __call__(self, environ: Environ,
+                 start_response: StartResponse) -> Iterable[bytes]:
+        iterable = super().__call__(environ, start_response)
+        if isinstance(self.body, FileBody) and self.status not in BODYLESS:
+            file_wrapper = environ.get('wsgi.file_wrapper')
+            if file_wrapper is not None:
+                # The server can use `sendfile` on the descriptor.
+                return file_wrapper(
+                    ResponseFile(self), self.body.chunk_size)
+        return iterable
+
     @classmethod
     def to_json(cls, code: HTTPCode = 200, body: Any | None = None,
-                headers: Headers | None = None):
-        data = orjson.dumps(body)
+                headers: Headers | None = None,
+                option: int | None = None):
+        data = orjson.dumps(body, option=option)
         if headers is None:
             headers = {'Content-Type': 'application/json'}
         else:
@@ -69,3 +362,75 @@ class Response(BaseResponse):
         else:
             headers['Content-Type'] = 'text/html; charset=utf-8'
         return cls(code, body, headers)
+
+
+class JSONResponse(Response):
+    """Response serializing its body using orjson.
+    `option` is a combination of `orjson.OPT_*` flags and `default`
+    the serializer of the unsupported types.
+    """
+
+    option: int = 0
+    headers_template: Headers = Headers({
+        'Content-Type': 'application/json'})
+    ndjson_headers_template: Headers = Headers({
+        'Content-Type': 'application/x-ndjson'})
+
+    def __init__(self, status: HTTPCode = 200, body: Any | None = None,
+                 headers: Headers | None = None,
+                 option: int | None = None,
+                 default: Callable[[Any], Any] | None = None):
+        data = orjson.dumps(
+            body, default=default,
+            option=self.option if option is None else option
+        )
+        super().__init__(
+            status, data, self.json_headers(headers, self.headers_template))
+        self.headers['Content-Length'] = str(len(data))
+
+    @staticmethod
+    def json_headers(headers: Headers | None, template: Headers) -> Headers:
+        if not headers:
+            return Headers(template)  # copy of the prebuilt headers.
+        headers = Headers(headers)
+        headers.update(template)
+        return headers
+
+    @classmethod
+    def stream(cls, items: Iterable[Any], status: HTTPCode = 200,
+               headers: Headers | None = None,
+               option: int | None = None,
+               default: Callable[[Any], Any] | None = None,
+               ndjson: bool = False,
+               chunk_size: int = 64 * 1024) -> Response:
+        """Creates a response serializing the items as they are
+        iterated, as a JSON array or as newline-delimited JSON.
+        The serialized items are buffered up to `chunk_size` bytes.
+        """
+        if option is None:
+            option = cls.option
+        if ndjson:
+            option |= orjson.OPT_APPEND_NEWLINE
+            template = cls.ndjson_headers_template
+        else:
+            template = cls.headers_template
+
+        def serialize() -> Iterator[bytes]:
+            buffer = bytearray() if ndjson else bytearray(b'[')
+            separator = b'' if ndjson else b','
+            first = True
+            for item in items:
+                if not first:
+                    buffer += separator
+                first = False
+                buffer += orjson.dumps(item, default=default, option=option)
+                if len(buffer) >= chunk_size:
+                    yield bytes(buffer)
+                    buffer.clear()
+            if not ndjson:
+                buffer += b']'
+            if buffer:
+                yield bytes(buffer)
+
+        return Response(
+            status, serialize(), cls.json_headers(headers, template))
@@ -1,11 +1,15 @@
+import contextvars
 import inspect
 import typing as t
 import logging
+from functools import wraps
 from http import HTTPStatus
 
 import autoroutes
+from kavallerie.datastructures import LRUCache
 from kavallerie.meta import (
     APIView, Endpoint, HTTPMethods, Route, RouteDefinition, RouteEndpoint)
+from kavallerie.pipeline import Pipeline, threaded
 from horseman.types import HTTPMethod
 from horseman.exceptions import HTTPError
 
@@ -55,19 +59,141 @@ def get_routables(view, methods: t.Optional[HTTPMethods] = None) \
         raise ValueError(f'Unknown type of route: {view}.')
 
 
+_route_params: contextvars.ContextVar[t.Mapping[str, t.Any]] = \
+    contextvars.ContextVar('route_params')
+
+
+def route_handler(endpoint: Endpoint, pipeline: Pipeline) -> Endpoint:
+    """Composes the endpoint with a route-specific pipeline.
+    Middlewares only get the request: the route params are passed
+    to the endpoint in a context variable.
+    The pipeline is compiled at registration, without configuration:
+    route middlewares receive no global configuration.
+    Blocking endpoints get an `async_endpoint` attribute, composed
+    with the pipeline in asynchronous mode, for ASGI applications:
+    the pipeline may then mix blocking and asynchronous middlewares.
+    """
+    if inspect.iscoroutinefunction(endpoint):
+        async def route_endpoint(request):
+            return await endpoint(request, **_route_params.get())
+
+        handler = pipeline.wrap(route_endpoint)
+
+        @wraps(endpoint)
+        async def routed(request, **params):
+            token = _route_params.set(params)
+            try:
+                return await handler(request)
+            finally:
+                _route_params.reset(token)
+    else:
+        def route_endpoint(request):
+            return endpoint(request, **_route_params.get())
+
+        handler = pipeline.wrap(route_endpoint)
+
+        @wraps(endpoint)
+        def routed(request, **params):
+            token = _route_params.set(params)
+            try:
+                return handler(request)
+            finally:
+                _route_params.reset(token)
+
+        async_handler = pipeline.wrap(threaded(route_endpoint))
+
+        @wraps(endpoint)
+        async def async_routed(request, **params):
+            token = _route_params.set(params)
+            try:
+                return await async_handler(request)
+            finally:
+                _route_params.reset(token)
+
+        routed.async_endpoint = async_routed
+
+    return routed
+
+
+def request_route(request) -> t.Optional[Route]:
+    """Route of the request. If it is not matched yet, the request
+    application matches it, when it can: see `RoutingApplication.match`.
+    A path registered for other methods has no route: the 405 is
+    left to the endpoint, after the middlewares.
+    """
+    if request.route is None and (
+            match := getattr(request.app, 'match', None)) is not None:
+        try:
+            return match(request)
+        except HTTPError as exc:
+            if exc.status != HTTPStatus.METHOD_NOT_ALLOWED:
+                raise
+            return None
+    return request.route
+
+
+class CacheInfo(t.NamedTuple):
+    hits: int
+    misses: int
+    static_size: int
+    dynamic_size: int
+
+
 class Routes(autoroutes.Routes):
+    """Routes registry.
+    Matches can be cached, keyed by path and method: static routes
+    and routes with params get separate caches, so that the unbounded
+    variety of params does not evict the static routes.
+    Cached routes are shared: their params must not be mutated.
+    """
 
-    __slots__ = ('extractor')
+    __slots__ = (
+        'extractor',
+        'static_cache_size',
+        'dynamic_cache_size',
+        '_static',
+        '_dynamic',
+        'hits',
+        'misses',
+    )
 
-    def __init__(self, extractor=get_routables):
+    def __init__(self, extractor=get_routables,
+                 static_cache_size: int = 0,
+                 dynamic_cache_size: int = 0):
         self.extractor = extractor
+        self.static_cache_size = static_cache_size
+        self.dynamic_cache_size = dynamic_cache_size
+        self._static = (
+            LRUCache(static_cache_size) if static_cache_size else None)
+        self._dynamic = (
+            LRUCache(dynamic_cache_size) if dynamic_cache_size else None)
+        self.hits = self.misses = 0
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            static_size=len(self._static or ()),
+            dynamic_size=len(self._dynamic or ())
+        )
+
+    def cache_clear(self):
+        if self._static is not None:
+            self._static.clear()
+        if self._dynamic is not None:
+            self._dynamic.clear()
 
     def add(self, path: str, payload: t.Dict[HTTPMethod, RouteEndpoint]):
         super().add(path, **payload)
+        self.cache_clear()
 
     def register(self, path: str, methods: HTTPMethods = None, **metadata):
+        pipeline = metadata.get('pipeline')
+
         def routing(view):
             for endpoint, verbs in self.extractor(view, methods):
+                if pipeline is not None:
+                    endpoint = route_handler(endpoint, pipeline)
                 self.add(path, {
                     method: RouteEndpoint(
                         endpoint=endpoint,
@@ -79,6 +205,15 @@ class Routes(autoroutes.Routes):
         return routing
 
     def match_method(self, path_info: str, method: HTTPMethod) -> Route:
+        key = (path_info, method)
+        if self._static is not None or self._dynamic is not None:
+            for cache in (self._static, self._dynamic):
+                if cache is not None and (
+                        route := cache.get(key)) is not None:
+                    self.hits += 1
+                    return route
+            self.misses += 1
+
         found, params = self.match(path_info)
         if found is None:
             return None
@@ -86,11 +221,17 @@ class Routes(autoroutes.Routes):
         if endpoint is None:
             raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED)
 
-        return Route(
+        route = Route(
             path=path_info,
             params=params,
             endpoint=endpoint,
         )
+        if params:
+            if self._dynamic is not None:
+                self._dynamic[key] = route
+        elif self._static is not None:
+            self._static[key] = route
+        return route
 
     def __iter__(self):
         def route_iterator(edges):
@@ -108,7 +249,11 @@ class Routes(autoroutes.Routes):
             raise TypeError(
                 "unsupported operand type(s) for +: '{self.__class__}'"
                 "and '{router.__class__}'")
-        routes = self.__class__()
+        routes = self.__class__(
+            extractor=self.extractor,
+            static_cache_size=self.static_cache_size,
+            dynamic_cache_size=self.dynamic_cache_size
+        )
         for routedef in self:
             routes.add(routedef.path, routedef.payload)
         for routedef in router:
@@ -0,0 +1,118 @@
+import asyncio
+import queue
+import threading
+import pytest
+from kavallerie.events import Event, Subscribers
+from kavallerie.publishers import AsyncPublisher, ThreadedPublisher
+
+
+class ObjectCreatedEvent(Event):
+
+    def __init__(self, obj):
+        self.obj = obj
+
+
+def test_notify_async():
+    subscribers = Subscribers()
+
+    @subscribers.subscribe(ObjectCreatedEvent)
+    def my_subscriber(event: ObjectCreatedEvent):
+        return threading.current_thread()
+
+    thread = asyncio.run(subscribers.notify_async(ObjectCreatedEvent(1)))
+    assert thread is not threading.current_thread()
+
+
+def test_threaded_publisher():
+    tracker = []
+    subscribers = Subscribers()
+
+    @subscribers.subscribe(ObjectCreatedEvent)
+    def my_subscriber(event: ObjectCreatedEvent):
+        if event.obj == 'error':
+            raise ValueError('Subscriber failure.')
+        tracker.append((event.obj, threading.current_thread()))
+
+    publisher = ThreadedPublisher(subscribers)
+    publisher.publish(ObjectCreatedEvent(1))
+    publisher.publish(ObjectCreatedEvent('error'))
+    publisher.publish(ObjectCreatedEvent(2))
+    publisher.drain()
+    assert [obj for obj, thread in tracker] == [1, 2]
+    assert tracker[0][1] is not threading.current_thread()
+
+    publisher.close()
+    with pytest.raises(RuntimeError):
+        publisher.publish(ObjectCreatedEvent(3))
+
+
+def test_threaded_publisher_backpressure():
+    blocker = threading.Event()
+    subscribers = Subscribers()
+
+    @subscribers.subscribe(ObjectCreatedEvent)
+    def my_subscriber(event: ObjectCreatedEvent):
+        blocker.wait()
+
+    publisher = ThreadedPublisher(subscribers, maxsize=1, timeout=0.01)
+    publisher.publish(ObjectCreatedEvent(1))
+    with pytest.raises(queue.Full):
+        # The worker may not have picked the first event yet.
+        publisher.publish(ObjectCreatedEvent(2))
+        publisher.publish(ObjectCreatedEvent(3))
+    blocker.set()
+    publisher.close()
+
+
+def test_threaded_publisher_close_race():
+    tracker = []
+    subscribers = Subscribers()
+
+    @subscribers.subscribe(ObjectCreatedEvent)
+    def my_subscriber(event: ObjectCreatedEvent):
+        tracker.append(event.obj)
+
+    publisher = ThreadedPublisher(subscribers, maxsize=8, workers=2)
+    published = []
+
+    def publish(start):
+        for idx in range(start, start + 200):
+            try:
+                publisher.publish(ObjectCreatedEvent(idx))
+            except RuntimeError:
+                return
+            published.append(idx)
+
+    threads = [
+        threading.Thread(target=publish, args=(start,))
+        for start in range(0, 800, 200)
+    ]
+    for thread in threads:
+        thread.start()
+    publisher.close()
+    for thread in threads:
+        thread.join()
+
+    # Every accepted event is notified, none is left in the queue.
+    assert sorted(tracker) == sorted(published)
+    assert publisher.queue.empty()
+    publisher.drain()
+
+
+def test_async_publisher():
+    tracker = []
+    subscribers = Subscribers()
+
+    @subscribers.subscribe(ObjectCreatedEvent)
+    def my_subscriber(event: ObjectCreatedEvent):
+        tracker.append(event.obj)
+
+    async def run():
+        publisher = AsyncPublisher(subscribers, maxsize=2, workers=2)
+        for idx in range(5):
+            await publisher.publish(ObjectCreatedEvent(idx))
+        await publisher.drain()
+        assert sorted(tracker) == [0, 1, 2, 3, 4]
+        await publisher.close()
+
+    asyncio.run(run())
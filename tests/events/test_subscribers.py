@@ -45,9 +45,9 @@ def test_registration():
     assert ObjectCreatedEvent in subscribers
     assert UserCreatedEvent not in subscribers
     assert len(subscribers) == 1
-    assert subscribers.get(ObjectCreatedEvent) == {
-        Subscription(my_subscriber)
-    }
+    assert list(subscribers.get(ObjectCreatedEvent)) == [
+        (0, Subscription(my_subscriber))
+    ]
     assert subscribers.get(UserCreatedEvent) is None
 
 
@@ -191,7 +191,7 @@ def test_registration_lineage_annotation():
         pass
 
     assert list(subscribers.get(UserCreatedEvent)) == [
-        Subscription(my_subscriber)
+        (0, Subscription(my_subscriber))
     ]
 
 
@@ -238,7 +238,7 @@ def test_nonstrict_registration():
         pass
 
     assert list(subscribers.get(NonEvent)) == [
-        Subscription(my_subscriber)
+        (0, Subscription(my_subscriber))
     ]
 
 
@@ -294,12 +294,67 @@ def test_subscribers_methods():
         pass
 
     assert len(subscribers) == 2
-    assert list(subscribers) == [
-        (ObjectCreatedEvent, {
-            Subscription(my_subscriber),
-            Subscription(other_subscriber)
-        }),
-        (UserCreatedEvent, {
-            Subscription(user_was_added),
-        }),
+    assert [(key, list(chain)) for key, chain in subscribers] == [
+        (ObjectCreatedEvent, [
+            (0, Subscription(my_subscriber)),
+            (0, Subscription(other_subscriber))
+        ]),
+        (UserCreatedEvent, [
+            (0, Subscription(user_was_added)),
+        ]),
     ]
+
+
+def test_subscriptions_index():
+    subscribers = Subscribers()
+
+    def my_subscriber(event: ObjectCreatedEvent):
+        pass
+
+    def user_was_added(event: UserCreatedEvent):
+        pass
+
+    subscribers.add(ObjectCreatedEvent, my_subscriber)
+    subscribers.add(UserCreatedEvent, user_was_added)
+    subscriptions = subscribers.subscriptions_for(UserCreatedEvent)
+    assert subscriptions == (
+        Subscription(user_was_added),
+        Subscription(my_subscriber),
+    )
+    assert subscribers.subscriptions_for(UserCreatedEvent) is subscriptions
+
+    subscribers.remove(UserCreatedEvent, user_was_added)
+    assert subscribers.subscriptions_for(UserCreatedEvent) == (
+        Subscription(my_subscriber),
+    )
+
+    subscribers.clear(ObjectCreatedEvent)
+    assert subscribers.subscriptions_for(UserCreatedEvent) == ()
+
+
+def test_subscription_order():
+    tracker = []
+    subscribers = Subscribers()
+
+    @subscribers.subscribe(ObjectCreatedEvent, order=10)
+    def expensive(event: ObjectCreatedEvent):
+        tracker.append('expensive')
+
+    @subscribers.subscribe(ObjectCreatedEvent)
+    def first(event: ObjectCreatedEvent):
+        tracker.append('first')
+
+    @subscribers.subscribe(ObjectCreatedEvent)
+    def second(event: ObjectCreatedEvent):
+        tracker.append('second')
+
+    @subscribers.subscribe(UserCreatedEvent, order=-1)
+    def cheap(event: UserCreatedEvent):
+        tracker.append('cheap')
+
+    # Subscribing twice is a no-op, even with another order.
+    subscribers.add(ObjectCreatedEvent, first)
+    subscribers.add(ObjectCreatedEvent, first, order=5)
+
+    subscribers.notify(UserCreatedEvent(1, 2))
+    assert tracker == ['cheap', 'first', 'second', 'expensive']
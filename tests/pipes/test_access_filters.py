@@ -1,8 +1,11 @@
+import pytest
+from horseman.exceptions import HTTPError
 from kavallerie.request import Request
 from kavallerie.response import Response
-from kavallerie.access import security_bypass, secured, TwoFA
+from kavallerie.access import security_bypass, secured, TwoFA, PathPrefixes
 from kavallerie.pipes.access import AccessFiltering
 from kavallerie.meta import User
+from kavallerie.app import RoutingApplication
 
 
 class UserClass(User):
@@ -109,3 +112,82 @@ def test_twoFA_filter(environ):
     request.twoFA = True
     response = TwoFA('/sms_qr_code', twofa_checker)(handler, request)
     assert response is None
+
+
+def test_path_prefixes():
+    prefixes = PathPrefixes(['/login', '/static/css/', '/api//public'])
+    assert prefixes.match('/login')
+    assert prefixes.match('/login/')
+    assert prefixes.match('/login/reset')
+    assert prefixes.match('/static/css/main.css')
+    assert prefixes.match('//static/./css')
+    assert prefixes.match('/api/public/doc')
+    assert not prefixes.match('/')
+    assert not prefixes.match('/log')
+    assert not prefixes.match('/login2')
+    assert not prefixes.match('/static')
+    assert not prefixes.match('/static/js/main.js')
+
+    assert PathPrefixes(['/']).match('/anything')
+    assert not PathPrefixes([]).match('/')
+
+
+def test_route_level_filtering(environ):
+    app = RoutingApplication()
+    calls = []
+
+    def counting_filter(caller, request):
+        calls.append(request.path)
+
+    def admin_filter(caller, request):
+        if request.user.id != 'admin':
+            return Response(403)
+
+    filtering = AccessFiltering(counting_filter, [secured()])
+    assert len(filtering.filters) == 2
+    app.pipeline.add(filtering)
+
+    @app.routes.register('/public', public=True)
+    def public(request):
+        return Response(200, body='public')
+
+    @app.routes.register('/private')
+    def private(request):
+        return Response(200, body='private')
+
+    @app.routes.register('/admin', access_filters=[admin_filter])
+    def admin(request):
+        return Response(200, body='admin')
+
+    assert app.resolve({**environ, 'PATH_INFO': '/public'}).status == 200
+    assert calls == []
+    assert app.resolve({**environ, 'PATH_INFO': '/private'}).status == 403
+    assert calls == ['/private']
+
+    app.request_factory = lambda app, environ: Request(
+        app, environ, user=UserClass('someone'))
+    assert app.resolve({**environ, 'PATH_INFO': '/private'}).status == 200
+    assert app.resolve({**environ, 'PATH_INFO': '/admin'}).status == 403
+    assert [filters for endpoint, filters in filtering._routes.values()] == [
+        (), (counting_filter, filtering.filters[1]),
+        (counting_filter, filtering.filters[1], admin_filter)
+    ]
+
+
+def test_route_filtering_method_not_allowed(environ):
+    app = RoutingApplication()
+    app.pipeline.add(AccessFiltering([secured()]))
+
+    @app.routes.register('/private', methods=['GET'])
+    def private(request):
+        return Response(200, body='private')
+
+    # The global filters run: anonymous users don't learn the methods.
+    environ = {**environ, 'PATH_INFO': '/private', 'REQUEST_METHOD': 'POST'}
+    assert app.resolve(environ).status == 403
+
+    app.request_factory = lambda app, environ: Request(
+        app, environ, user=UserClass('someone'))
+    with pytest.raises(HTTPError) as exc:
+        app.resolve(environ)
+    assert exc.value.status == 405
@@ -0,0 +1,237 @@
+import pytest
+import threading
+import time
+from kavallerie.app import RoutingApplication
+from kavallerie.events import Event
+from kavallerie.response import Response
+from kavallerie.pipes.cache import (
+    CachedResponse, ResponseCache, FileBackend, MemoryBackend)
+from webtest import TestApp as WebApp
+
+
+class PageChanged(Event):
+
+    def __init__(self, path):
+        self.path = path
+
+
+def make_app(cache):
+    app = RoutingApplication()
+    app.pipeline.add(cache)
+    calls = []
+
+    @app.routes.register('/cached', methods=['GET', 'HEAD'], cache=True)
+    def cached(request):
+        calls.append(request.path)
+        return Response(200, body=f'cached {len(calls)}', headers={
+            'Content-Type': 'text/plain'})
+
+    @app.routes.register('/short', cache=0.01)
+    def short(request):
+        calls.append(request.path)
+        return Response(200, body=f'short {len(calls)}')
+
+    @app.routes.register('/uncached')
+    def uncached(request):
+        calls.append(request.path)
+        return Response(200, body=f'uncached {len(calls)}')
+
+    @app.routes.register('/cookie', cache=True)
+    def cookie(request):
+        calls.append(request.path)
+        response = Response(200, body=f'cookie {len(calls)}')
+        response.cookies.set('name', 'value')
+        return response
+
+    return WebApp(app), app, calls
+
+
+@pytest.fixture(params=['memory', 'file'])
+def backend(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryBackend(maxsize=10)
+    return FileBackend(tmp_path / 'cache', maxsize=10)
+
+
+def test_response_cache(backend):
+    test, app, calls = make_app(ResponseCache(backend=backend))
+
+    assert test.get('/cached').body == b'cached 1'
+    response = test.get('/cached')
+    assert response.body == b'cached 1'
+    assert response.headers['Content-Type'] == 'text/plain'
+    assert test.head('/cached').status == '200 OK'
+    assert len(calls) == 1
+
+    # The query string is part of the key.
+    assert test.get('/cached?page=2').body == b'cached 2'
+    assert test.get('/cached?page=2').body == b'cached 2'
+
+    assert test.get('/uncached').body == b'uncached 3'
+    assert test.get('/uncached').body == b'uncached 4'
+
+    assert test.get('/cookie').body == b'cookie 5'
+    assert test.get('/cookie').body == b'cookie 6'
+
+
+def test_response_cache_ttl(backend):
+    test, app, calls = make_app(ResponseCache(backend=backend))
+    assert test.get('/short').body == b'short 1'
+    time.sleep(0.02)
+    assert test.get('/short').body == b'short 2'
+
+
+def test_response_cache_vary(backend):
+    test, app, calls = make_app(
+        ResponseCache(backend=backend, vary=('Accept-Language',)))
+    headers = {'Accept-Language': 'fr'}
+    assert test.get('/cached', headers=headers).body == b'cached 1'
+    assert test.get('/cached', headers=headers).body == b'cached 1'
+    assert test.get('/cached').body == b'cached 2'
+
+
+def test_response_cache_credentials(backend):
+    test, app, calls = make_app(ResponseCache(backend=backend))
+
+    @app.routes.register('/public', cache=True, cache_private=True)
+    def public(request):
+        calls.append(request.path)
+        return Response(200, body=f'public {len(calls)}')
+
+    # Authenticated responses are never served to anonymous requests.
+    authorization = {'Authorization': 'Basic dXNlcjpzZWNyZXQ='}
+    assert test.get('/cached', headers=authorization).body == b'cached 1'
+    assert test.get('/cached').body == b'cached 2'
+    assert test.get('/cached', headers=authorization).body == b'cached 3'
+    assert test.get('/cached').body == b'cached 2'
+
+    test.set_cookie('sid', 'signed-session-id')
+    assert test.get('/cached').body == b'cached 4'
+    test.reset()
+    test.set_cookie('other', 'value')
+    assert test.get('/cached').body == b'cached 2'
+
+    # The route opted in: credentials are ignored.
+    assert test.get('/public', headers=authorization).body == b'public 5'
+    assert test.get('/public').body == b'public 5'
+
+
+def test_response_cache_host(backend):
+    test, app, calls = make_app(ResponseCache(backend=backend))
+    one = {'Host': 'one.example.com'}
+    two = {'Host': 'two.example.com'}
+    assert test.get('/cached', headers=one).body == b'cached 1'
+    assert test.get('/cached', headers=two).body == b'cached 2'
+    assert test.get('/cached', headers=one).body == b'cached 1'
+    assert test.get(
+        '/cached', extra_environ={'SCRIPT_NAME': '/tenant'}
+    ).body == b'cached 3'
+
+
+def test_response_cache_invalidation(backend):
+    cache = ResponseCache(backend=backend)
+    test, app, calls = make_app(cache)
+    cache.invalidate_on(
+        app.subscribers, PageChanged, lambda event: [event.path])
+
+    assert test.get('/cached').body == b'cached 1'
+    assert test.get('/cached?page=2').body == b'cached 2'
+    app.subscribers.notify(PageChanged('/other'))
+    assert test.get('/cached').body == b'cached 1'
+
+    app.subscribers.notify(PageChanged('/cached'))
+    assert test.get('/cached').body == b'cached 3'
+    assert test.get('/cached?page=2').body == b'cached 4'
+
+    cache.invalidate()
+    assert test.get('/cached').body == b'cached 5'
+
+
+def test_file_backend_eviction(tmp_path):
+    cache = ResponseCache(backend=FileBackend(tmp_path, maxsize=2))
+    test, app, calls = make_app(cache)
+    for page in range(3):
+        test.get(f'/cached?page={page}')
+    assert len(list(tmp_path.glob('*.entry'))) == 2
+
+
+def test_file_backend_count(tmp_path, monkeypatch):
+    backend = FileBackend(tmp_path, maxsize=10)
+    for index in range(10):
+        backend.set(('/a', '', '', str(index), ()), entry())
+    for _ in range(5):
+        backend.set(('/a', '', '', '0', ()), entry())
+    assert backend.count == 10
+
+    # Hits do not write to the file.
+    monkeypatch.setattr('os.utime', None)
+    assert backend.get(('/a', '', '', '0', ())) is not None
+
+    # Beyond `maxsize`, the oldest entries are evicted, down to 90%.
+    backend.set(('/a', '', '', '10', ()), entry())
+    assert backend.count == 9
+    assert len(list(tmp_path.glob('*.entry'))) == 9
+
+    backend.invalidate('/a')
+    assert backend.count == 0
+    assert FileBackend(tmp_path).count == 0
+
+
+def entry(body=b'', ttl=60):
+    return CachedResponse(200, (), body, time.time() + ttl)
+
+
+def test_memory_backend_index():
+    backend = MemoryBackend(maxsize=3)
+    backend.set(('/a', '', ()), entry())
+    backend.set(('/a', 'page=2', ()), entry())
+    backend.set(('/b', '', ()), entry())
+    assert backend.paths == {
+        '/a': {('/a', '', ()), ('/a', 'page=2', ())},
+        '/b': {('/b', '', ())},
+    }
+
+    # The least recently used entry is evicted, and unindexed.
+    assert backend.get(('/a', '', ())) is not None
+    backend.set(('/c', '', ()), entry())
+    assert backend.get(('/a', 'page=2', ())) is None
+    assert backend.paths['/a'] == {('/a', '', ())}
+
+    backend.invalidate('/a')
+    assert '/a' not in backend.paths
+    assert list(backend.entries) == [('/b', '', ()), ('/c', '', ())]
+
+    backend.invalidate()
+    assert not backend.entries and not backend.paths
+
+
+def test_memory_backend_threads():
+    backend = MemoryBackend(maxsize=500)
+    keys = [(f'/{index % 10}', str(index), ()) for index in range(500)]
+    errors = []
+
+    def reader():
+        try:
+            for _ in range(20):
+                for key in keys:
+                    backend.get(key)
+        except Exception as exc:
+            errors.append(exc)
+
+    def invalidator():
+        try:
+            for _ in range(20):
+                for key in keys:
+                    backend.set(key, entry())
+                for index in range(10):
+                    backend.invalidate(f'/{index}')
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    threads.append(threading.Thread(target=invalidator))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
@@ -0,0 +1,93 @@
+import gzip
+import zlib
+import pytest
+from kavallerie.request import Request
+from kavallerie.response import Response, JSONResponse
+from kavallerie.pipes.compression import Compression
+
+
+PAYLOAD = b'{"message": "Hello, world!"}' * 100
+
+
+def request(environ, encoding=None):
+    if encoding is not None:
+        environ = {**environ, 'HTTP_ACCEPT_ENCODING': encoding}
+    return Request(app=None, environ=environ)
+
+
+def test_gzip(environ):
+
+    def handler(request):
+        return Response(200, body=PAYLOAD, headers={
+            'Content-Type': 'application/json', 'ETag': '"v1"'})
+
+    middleware = Compression()(handler)
+    response = middleware(request(environ, 'deflate;q=0.5, gzip'))
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert response.headers['ETag'] == 'W/"v1"'
+    assert int(response.headers['Content-Length']) == len(response.body)
+    assert gzip.decompress(response.body) == PAYLOAD
+
+
+def test_deflate_stream(environ):
+
+    def handler(request):
+        return JSONResponse.stream(range(1000), chunk_size=100)
+
+    middleware = Compression(level=9)(handler)
+    response = middleware(request(environ, 'deflate'))
+    assert response.headers['Content-Encoding'] == 'deflate'
+    assert 'Content-Length' not in response.headers
+    assert zlib.decompress(b''.join(response)) == (
+        b'[' + b','.join(str(i).encode() for i in range(1000)) + b']')
+
+
+def test_not_compressed(environ):
+    responses = iter((
+        Response(200, body='small'),
+        Response(200, body=PAYLOAD, headers={'Content-Type': 'image/png'}),
+        Response(200, body=PAYLOAD, headers={'Content-Encoding': 'br'}),
+        Response(304),
+    ))
+
+    def handler(request):
+        return next(responses)
+
+    middleware = Compression()(handler)
+    response = middleware(request(environ, 'gzip'))
+    assert response.body == 'small'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+
+    for _ in range(3):
+        response = middleware(request(environ, 'gzip'))
+        assert response.body in (PAYLOAD, None)
+        assert 'Vary' not in response.headers
+
+
+def test_not_accepted(environ):
+
+    def handler(request):
+        return Response(200, body=PAYLOAD, headers={'Vary': 'Cookie'})
+
+    middleware = Compression()(handler)
+    for encoding in (None, 'br', 'gzip;q=0', '*;q=1, gzip;q=0, deflate;q=0'):
+        response = middleware(request(environ, encoding))
+        assert response.body == PAYLOAD
+        assert response.headers['Vary'] == 'Cookie, Accept-Encoding'
+
+
+def test_unsupported_encoding():
+    with pytest.raises(ValueError):
+        Compression(encodings=('br',))
+
+
+def test_refused_encoding(environ):
+
+    def handler(request):
+        return Response(200, body=PAYLOAD)
+
+    middleware = Compression()(handler)
+    response = middleware(request(environ, '*, gzip;q=0'))
+    assert response.headers['Content-Encoding'] == 'deflate'
+    assert zlib.decompress(response.body) == PAYLOAD
@@ -0,0 +1,78 @@
+from kavallerie.request import Request
+from kavallerie.response import Response
+from kavallerie.pipes.conditional import ConditionalGET, Validators
+
+
+def test_validator_short_circuit(environ):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return Response(200, body='content')
+
+    def validator(request):
+        return Validators(etag='W/"v1"', last_modified=1700000000)
+
+    middleware = ConditionalGET(validator=validator)(handler)
+    request = Request(app=None, environ={
+        **environ, 'HTTP_IF_NONE_MATCH': '"v0", "v1"'})
+    response = middleware(request)
+    assert response.status == 304
+    assert response.headers['ETag'] == 'W/"v1"'
+    assert response.headers['Last-Modified'] == (
+        'Tue, 14 Nov 2023 22:13:20 GMT')
+    assert not calls
+
+    request = Request(app=None, environ={
+        **environ, 'HTTP_IF_NONE_MATCH': '"v2"'})
+    response = middleware(request)
+    assert response.status == 200
+    assert len(calls) == 1
+
+
+def test_computed_etag(environ):
+
+    def handler(request):
+        return Response(200, body='content', headers={
+            'Content-Type': 'text/plain'})
+
+    middleware = ConditionalGET(compute_etag=True)(handler)
+    response = middleware(Request(app=None, environ=environ))
+    assert response.status == 200
+    etag = response.headers['ETag']
+
+    response = middleware(Request(app=None, environ={
+        **environ, 'HTTP_IF_NONE_MATCH': etag}))
+    assert response.status == 304
+    assert response.body is None
+    assert response.headers['ETag'] == etag
+    assert 'Content-Type' not in response.headers
+
+
+def test_if_modified_since(environ):
+
+    def handler(request):
+        return Response(200, body='content', headers={
+            'Last-Modified': 'Tue, 14 Nov 2023 22:13:20 GMT'})
+
+    middleware = ConditionalGET()(handler)
+    response = middleware(Request(app=None, environ={
+        **environ,
+        'HTTP_IF_MODIFIED_SINCE': 'Wed, 15 Nov 2023 00:00:00 GMT'}))
+    assert response.status == 304
+
+    response = middleware(Request(app=None, environ={
+        **environ,
+        'HTTP_IF_MODIFIED_SINCE': 'Mon, 13 Nov 2023 00:00:00 GMT'}))
+    assert response.status == 200
+
+
+def test_unsafe_method(environ):
+
+    def handler(request):
+        return Response(200, body='content', headers={'ETag': '"v1"'})
+
+    middleware = ConditionalGET()(handler)
+    response = middleware(Request(app=None, environ={
+        **environ, 'REQUEST_METHOD': 'POST', 'HTTP_IF_NONE_MATCH': '*'}))
+    assert response.status == 200
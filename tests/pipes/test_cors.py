@@ -1,3 +1,6 @@
+from functools import partial
+from webtest import TestApp as WSGIApp
+from kavallerie.app import RoutingApplication
 from kavallerie.cors import CORSPolicy
 from kavallerie.request import Request
 from kavallerie.response import Response
@@ -37,7 +40,7 @@ def test_preflight(environ):
     opts_env = {
         **environ,
         'REQUEST_METHOD': 'OPTIONS',
-        'ORIGIN': '*'
+        'HTTP_ORIGIN': '*'
     }
     request = Request(None, environ=opts_env, cors_policy=policy)
     response = CORS(handler)(request)
@@ -48,3 +51,76 @@ def test_preflight(environ):
         'Access-Control-Expose-Headers': 'Accept-Encoding',
         'Access-Control-Allow-Headers': 'X-Custom-Header, Accept-Encoding'
     }
+
+
+def test_preflight_multiple_origins(environ):
+
+    def handler(request):
+        return Response(204)
+
+    policy = CORSPolicy(
+        origins=['https://app.example.com'],
+        origin_patterns=['https://*.tenants.example.com'],
+    )
+    opts_env = {
+        **environ,
+        'REQUEST_METHOD': 'OPTIONS',
+        'HTTP_ORIGIN': 'https://demo.tenants.example.com'
+    }
+    request = Request(None, environ=opts_env, cors_policy=policy)
+    response = CORS(handler)(request)
+    assert response.status == 200
+    assert dict(response.headers.coalesced_items()) == {
+        'Vary': 'Origin',
+        'Access-Control-Allow-Origin': 'https://demo.tenants.example.com',
+    }
+
+    opts_env['HTTP_ORIGIN'] = 'https://unknown.example.com'
+    request = Request(None, environ=opts_env, cors_policy=policy)
+    response = CORS(handler)(request)
+    assert dict(response.headers.coalesced_items()) == {'Vary': 'Origin'}
+
+
+def test_cors_middleware():
+    policy = CORSPolicy(
+        origins=['https://app.example.com'],
+        methods=['GET', 'POST'],
+    )
+    app = RoutingApplication(
+        request_factory=partial(Request, cors_policy=policy))
+    app.pipeline.add(CORS)
+
+    @app.routes.register('/data')
+    def data(request):
+        return Response(200, body=b'data', headers={'Vary': 'Cookie'})
+
+    browser = WSGIApp(app)
+    response = browser.options('/data', headers={
+        'Origin': 'https://app.example.com',
+        'Access-Control-Request-Method': 'POST',
+        'Access-Control-Request-Headers': 'X-Token',
+    })
+    assert response.status_int == 200
+    assert response.headers['Access-Control-Allow-Origin'] == \
+        'https://app.example.com'
+    assert response.headers['Access-Control-Allow-Methods'] == 'GET, POST'
+    assert response.headers['Access-Control-Allow-Headers'] == 'X-Token'
+    assert response.headers['Vary'] == 'Origin'
+
+    # Actual request: the policy headers are added to the response.
+    response = browser.get('/data', headers={
+        'Origin': 'https://app.example.com'})
+    assert response.body == b'data'
+    assert response.headers['Access-Control-Allow-Origin'] == \
+        'https://app.example.com'
+    assert response.headers['Vary'] == 'Cookie, Origin'
+
+    response = browser.get('/data', headers={
+        'Origin': 'https://unknown.example.com'})
+    assert 'Access-Control-Allow-Origin' not in response.headers
+    assert response.headers['Vary'] == 'Cookie, Origin'
+
+    # Same origin requests are untouched.
+    response = browser.get('/data')
+    assert 'Access-Control-Allow-Origin' not in response.headers
+    assert response.headers['Vary'] == 'Cookie'
@@ -0,0 +1,153 @@
+import pytest
+from kavallerie.events import Batch, Event, Subscribers
+from kavallerie.request import Request
+from kavallerie.response import Response
+from kavallerie.pipes.events import Deferred
+from kavallerie.pipes.transaction import Transaction
+
+
+class ObjectCreatedEvent(Event):
+
+    def __init__(self, obj):
+        self.obj = obj
+
+
+def tracked_subscribers(tracker):
+    subscribers = Subscribers()
+
+    @subscribers.subscribe(ObjectCreatedEvent)
+    def created(event: ObjectCreatedEvent):
+        tracker.append(event.obj)
+
+    @subscribers.subscribe(Batch[ObjectCreatedEvent])
+    def bulk_created(event: Batch):
+        tracker.append([event.obj for event in event.events])
+
+    return subscribers
+
+
+def test_batch_type():
+    assert Batch[ObjectCreatedEvent] is Batch[ObjectCreatedEvent]
+    assert Batch[ObjectCreatedEvent].event_type is ObjectCreatedEvent
+    assert list(Batch[ObjectCreatedEvent].lineage()) == [
+        Batch[ObjectCreatedEvent], Batch
+    ]
+
+
+def test_batch_type_lineage(environ):
+
+    class DocumentCreatedEvent(ObjectCreatedEvent):
+        pass
+
+    assert list(Batch[DocumentCreatedEvent].lineage()) == [
+        Batch[DocumentCreatedEvent], Batch[ObjectCreatedEvent], Batch
+    ]
+
+    def handler(request):
+        request.utilities['events'].add(DocumentCreatedEvent(1))
+        request.utilities['events'].add(DocumentCreatedEvent(2))
+        return Response(201)
+
+    tracker = []
+    deferred = Deferred(tracked_subscribers(tracker))
+    deferred(handler)(Request(None, environ=environ))
+    assert tracker == [1, 2, [1, 2]]
+
+
+def test_deferred_events(environ):
+
+    def handler(request):
+        request.utilities['events'].add(ObjectCreatedEvent(1))
+        request.utilities['events'].add(ObjectCreatedEvent(2))
+        assert tracker == []
+        return Response(201)
+
+    def fail_handler(request):
+        request.utilities['events'].add(ObjectCreatedEvent(1))
+        return Response(400)
+
+    tracker = []
+    deferred = Deferred(tracked_subscribers(tracker))
+
+    request = Request(None, environ=environ)
+    deferred(handler)(request)
+    assert tracker == [1, 2, [1, 2]]
+    assert 'events' not in request.utilities
+
+    tracker.clear()
+    request = Request(None, environ=environ)
+    deferred(fail_handler)(request)
+    assert tracker == []
+
+
+def test_deferred_events_with_transaction(environ):
+
+    def handler(request):
+        request.utilities['events'].add(ObjectCreatedEvent(1))
+        return Response(201)
+
+    def aborting_handler(request):
+        request.utilities['events'].add(ObjectCreatedEvent(1))
+        return Response(400)
+
+    tracker = []
+    deferred = Deferred(tracked_subscribers(tracker))
+    transaction = Transaction()
+
+    request = Request(None, environ=environ)
+    transaction(deferred(handler))(request)
+    assert tracker == [1, [1]]
+
+    tracker.clear()
+    request = Request(None, environ=environ)
+    transaction(deferred(aborting_handler))(request)
+    assert tracker == []
+
+
+def test_deferred_events_outside_transaction(environ):
+
+    def handler(request):
+        request.utilities['events'].add(ObjectCreatedEvent(1))
+        return Response(201)
+
+    def dooming_handler(request):
+        request.utilities['events'].add(ObjectCreatedEvent(1))
+        request.utilities['transaction_manager'].get().doom()
+        return Response(201)
+
+    tracker = []
+    deferred = Deferred(tracked_subscribers(tracker))
+    transaction = Transaction()
+
+    request = Request(None, environ=environ)
+    deferred(transaction(handler))(request)
+    assert tracker == [1, [1]]
+
+    # The transaction is doomed after the events were added:
+    # the successful status of the response does not matter.
+    tracker.clear()
+    request = Request(None, environ=environ)
+    deferred(transaction(dooming_handler))(request)
+    assert tracker == []
+
+
+def test_deferred_events_error(environ):
+
+    def handler(request):
+        request.utilities['events'].add(ObjectCreatedEvent(1))
+        raise NotImplementedError
+
+    tracker = []
+    deferred = Deferred(tracked_subscribers(tracker))
+
+    request = Request(None, environ=environ)
+    with pytest.raises(NotImplementedError):
+        deferred(handler)(request)
+    assert 'events' not in request.utilities
+    assert tracker == []
+
+    request = Request(None, environ=environ)
+    with pytest.raises(NotImplementedError):
+        Transaction()(deferred(handler))(request)
+    assert 'events' not in request.utilities
+    assert tracker == []
@@ -81,3 +81,45 @@ def test_session_middleware(http_session_store):
             'created': 1732622401,
             'expires': 1732622701,
         }
+
+
+def test_lazy_session(http_session_store):
+    store = http_session_store()
+    app = RoutingApplication()
+    app.pipeline.add(HTTPSession(store=store, secret='my secret'))
+    reads = []
+    get = store.get
+
+    def counting_get(sid):
+        reads.append(sid)
+        return get(sid)
+
+    store.get = counting_get
+
+    @app.routes.register('/add')
+    def add(request):
+        request.utilities['http_session']['value'] = 1
+        return Response(201)
+
+    @app.routes.register('/api')
+    def api(request):
+        assert not request.utilities['http_session'].loaded
+        return Response(200)
+
+    @app.routes.register('/read')
+    def read(request):
+        return Response(200, body=str(
+            request.utilities['http_session']['value']))
+
+    test = WSGIApp(app)
+    response = test.get('/add')
+    cookie = response.headers.get('Set-Cookie')
+    assert cookie
+
+    response = test.get('/api', headers={'Cookie': cookie})
+    assert 'Set-Cookie' not in response.headers
+    assert reads == []
+
+    response = test.get('/read', headers={'Cookie': cookie})
+    assert response.body == b'1'
+    assert reads == ['00000000-0000-0000-0000-000000000000']
@@ -108,3 +108,62 @@ def test_override_method_registration_operation():
             }
         )
     ]
+
+
+def test_match_cache():
+    routes = Routes(static_cache_size=2, dynamic_cache_size=1)
+
+    @routes.register('/static')
+    def static(request):
+        pass
+
+    @routes.register('/item/{id}')
+    def item(request, id):
+        pass
+
+    route = routes.match_method('/static', 'GET')
+    assert routes.match_method('/static', 'GET') is route
+    assert routes.cache_info() == (1, 1, 1, 0)
+
+    route = routes.match_method('/item/1', 'GET')
+    assert route.params == {'id': '1'}
+    assert routes.match_method('/item/1', 'GET') is route
+    assert routes.cache_info() == (2, 2, 1, 1)
+
+    # The dynamic cache is bounded.
+    routes.match_method('/item/2', 'GET')
+    assert routes.match_method('/item/1', 'GET') is not route
+    assert routes.cache_info() == (2, 4, 1, 1)
+
+    # Unknown paths are not cached.
+    assert routes.match_method('/unknown', 'GET') is None
+    assert routes.cache_info() == (2, 5, 1, 1)
+
+    # Adding a route invalidates the caches.
+    @routes.register('/static', methods=['POST'])
+    def static_post(request):
+        pass
+
+    assert routes.cache_info() == (2, 5, 0, 0)
+    route = routes.match_method('/static', 'POST')
+    assert route.endpoint.endpoint is static_post
+
+
+def test_match_cache_merge():
+    router1 = Routes(static_cache_size=10)
+    router2 = Routes()
+
+    @router1.register('/test')
+    def my_get(request):
+        pass
+
+    @router2.register('/test')
+    def my_other_get(request):
+        pass
+
+    assert router1.match_method('/test', 'GET').endpoint.endpoint is my_get
+    router3 = router1 + router2
+    assert router3.static_cache_size == 10
+    assert router3.cache_info() == (0, 0, 0, 0)
+    route = router3.match_method('/test', 'GET')
+    assert route.endpoint.endpoint is my_other_get
@@ -1,5 +1,7 @@
 import pytest
-from kavallerie.actions import ActionStore, Action
+from kavallerie.actions import (
+    ActionStore, Action, Actions, ContextualActions)
+from kavallerie.request import Request
 from prejudice.errors import ConstraintsErrors, ConstraintError
 
 
@@ -188,3 +190,155 @@ def test_classifiers_exact():
         resolve=vietnamese_soup_with_peanuts,
         classifiers=frozenset({'soup', 'phô'})
     )]
+
+
+def test_actions_lookup():
+
+    class Base:
+        pass
+
+    class Document(Base):
+        pass
+
+    actions = Actions()
+
+    @actions.register(Base, 'view', classifiers=['tab'],
+                      attributes={'order': 2})
+    def view(request, context):
+        return '/view'
+
+    @actions.register(Document, 'edit', classifiers=['tab', 'admin'],
+                      attributes={'order': 1})
+    def edit(request, context):
+        return '/edit'
+
+    found = actions.lookup(Document, 'tab')
+    assert [action.name for action in found] == ['edit', 'view']
+    assert actions.lookup(Document, 'tab') is found
+    assert [action.name for action in actions.lookup(Base, 'tab')] == [
+        'view']
+    assert [action.name for action in actions.lookup(
+        Document, 'admin', 'tab', mode='exact')] == ['edit']
+    assert [action.name for action in actions.lookup(
+        Document, 'admin', 'other', mode='one_of')] == ['edit']
+    assert [action.name for action in actions.lookup(Document)] == [
+        'edit', 'view']
+
+    with pytest.raises(ValueError):
+        actions.lookup(Document, 'tab', mode='unknown')
+
+    # Adding an action invalidates the index.
+    @actions.register(Document, 'delete', classifiers=['tab'])
+    def delete(request, context):
+        return '/delete'
+
+    assert [action.name for action in actions.lookup(Document, 'tab')] == [
+        'edit', 'view', 'delete']
+
+    # So do the changes of the class actions.
+    actions.get_actions_for(Base).add(view, 'other', classifiers=['tab'])
+    assert [action.name for action in actions.lookup(Document, 'tab')] == [
+        'edit', 'view', 'delete', 'other']
+    del actions.get_actions_for(Document)['delete']
+    assert [action.name for action in actions.lookup(Document, 'tab')] == [
+        'edit', 'view', 'other']
+
+
+def test_classifiers_index():
+    actions = ActionStore()
+
+    def resolver():
+        pass
+
+    actions.add(resolver, 'a', classifiers=['x', 'y'])
+    actions.add(resolver, 'b', classifiers=['y'])
+    actions.add(resolver, 'c', classifiers=['x', 'y'])
+
+    assert [a.name for a in actions.partial('y')] == ['a', 'b', 'c']
+    assert [a.name for a in actions.partial('x', 'y')] == ['a', 'c']
+    assert [a.name for a in actions.exact('y', 'x')] == ['a', 'c']
+    assert [a.name for a in actions.one_of('x', 'z')] == ['a', 'c']
+
+    # Overriding keeps the position but updates the index.
+    actions.add(resolver, 'a', classifiers=['z'])
+    assert [a.name for a in actions.partial('y')] == ['b', 'c']
+    assert [a.name for a in actions.one_of('x', 'z')] == ['a', 'c']
+
+    del actions['c']
+    assert [a.name for a in actions.partial('x')] == []
+    assert actions.pop('b').name == 'b'
+    assert [a.name for a in actions.one_of('y', 'z')] == ['a']
+
+    actions.clear()
+    assert list(actions.one_of('z')) == []
+
+
+def test_contextual_actions_memoization(environ):
+    evaluated = []
+    resolved = []
+
+    class Document:
+        pass
+
+    def tracked(action, context, request):
+        evaluated.append(action.name)
+
+    actions = Actions()
+
+    @actions.register(Document, 'view', classifiers=['tab'],
+                      conditions=[tracked])
+    def view(request, context):
+        resolved.append('view')
+        return '/view'
+
+    request = Request(None, environ={**environ, 'PATH_INFO': '/view'})
+    contextual = ContextualActions(request, actions)
+    document = Document()
+
+    for classifiers in (('tab',), ()):
+        found = list(contextual.iter(classifiers, context=document))
+        assert len(found) == 1
+        assert found[0].__html__() == (
+            '<a class="nav-link active" href="/view"> '
+            '<i class=""> </i>None</a>'
+        )
+    assert contextual.get('view', context=document).url == '/view'
+    assert evaluated == ['view']
+    assert resolved == ['view']
+
+    # Another context is evaluated on its own.
+    other = Document()
+    assert contextual.get('view', context=other) is not None
+    assert evaluated == ['view', 'view']
+
+
+def test_contextual_actions_render(environ):
+
+    class Document:
+        pass
+
+    actions = Actions()
+
+    @actions.register(Document, 'view', title='View', classifiers=['tab'])
+    def view(request, context):
+        return '/app/view'
+
+    @actions.register(Document, 'edit', title='Edit', classifiers=['tab'],
+                      attributes={'css': 'icon-edit'})
+    def edit(request, context):
+        return '/app/edit'
+
+    @actions.register(Document, 'hidden', classifiers=['tab'])
+    def hidden(request, context):
+        return None
+
+    request = Request(None, environ={
+        **environ, 'SCRIPT_NAME': '/app', 'PATH_INFO': '/edit'})
+    contextual = ContextualActions(request, actions)
+    assert contextual.render(['tab'], context=Document()) == (
+        '<a class="nav-link" href="/app/view"> '
+        '<i class=""> </i>View</a>'
+        '<a class="nav-link active" href="/app/edit"> '
+        '<i class="icon-edit"> </i>Edit</a>'
+    )
+    assert contextual.render(['unknown'], context=Document()) == ''
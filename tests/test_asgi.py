@@ -0,0 +1,319 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from kavallerie.app import RoutingApplication
+from kavallerie.pipeline import Pipeline
+from kavallerie.request import AsyncRequest
+from kavallerie.response import Response
+
+
+def http_scope(path='/', method='GET', headers=(), query_string=b''):
+    return {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'root_path': '',
+        'query_string': query_string,
+        'headers': list(headers),
+        'server': ('test_domain.com', 80),
+        'client': ('127.0.0.1', 4242),
+    }
+
+
+def call(app, scope, body=b''):
+    messages = [
+        {'type': 'http.request', 'body': body[:3], 'more_body': True},
+        {'type': 'http.request', 'body': body[3:], 'more_body': False},
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start, *body_parts = sent
+    assert start['type'] == 'http.response.start'
+    return (
+        start['status'],
+        dict(start['headers']),
+        b''.join(part['body'] for part in body_parts)
+    )
+
+
+def capitalize(app, config=None):
+    def capitalize_middleware(request):
+        response = app(request)
+        response.body = response.body.upper()
+        return response
+    return capitalize_middleware
+
+
+def suffix(app, config=None):
+    async def suffix_middleware(request):
+        response = await app(request)
+        response.body += ' my suffix'
+        return response
+    return suffix_middleware
+
+
+def test_asgi_sync_endpoint():
+    app = RoutingApplication()
+
+    @app.routes.register('/', methods=['POST'])
+    def view(request):
+        assert request.body.read() == b'some body'
+        return Response(200, body=f'{request.method} {request.path}')
+
+    status, headers, body = call(
+        app, http_scope(method='POST'), body=b'some body')
+    assert status == 200
+    assert body == b'POST /'
+
+
+def test_asgi_blocking_middleware_body():
+    app = RoutingApplication()
+    bodies = []
+
+    def reading(handler, config=None):
+        def reading_middleware(request):
+            bodies.append(request.body.read())
+            request.body.seek(0)
+            return handler(request)
+        return reading_middleware
+
+    app.pipeline.add(reading)
+
+    @app.routes.register('/', methods=['POST'])
+    def view(request):
+        bodies.append(request.body.read())
+        return Response(200, body='ok')
+
+    status, headers, body = call(
+        app, http_scope(method='POST'), body=b'some body')
+    assert status == 200
+    assert bodies == [b'some body', b'some body']
+
+
+def test_asgi_async_endpoint():
+    app = RoutingApplication()
+
+    @app.routes.register('/json', methods=['POST'])
+    async def view(request):
+        assert isinstance(request, AsyncRequest)
+        data = await request.get_data()
+        return Response.to_json(body=data.json)
+
+    status, headers, body = call(
+        app,
+        http_scope(
+            path='/json', method='POST',
+            headers=[(b'content-type', b'application/json')]),
+        body=b'{"a": 1}'
+    )
+    assert status == 200
+    assert headers[b'Content-Type'] == b'application/json'
+    assert body == b'{"a":1}'
+
+
+def test_asgi_not_found():
+    app = RoutingApplication()
+    status, headers, body = call(app, http_scope(path='/unknown'))
+    assert status == 404
+
+
+def test_asgi_mixed_pipeline():
+    app = RoutingApplication()
+    app.pipeline.add(suffix, order=1)
+    app.pipeline.add(capitalize, order=2)
+
+    @app.routes.register('/')
+    async def view(request):
+        return Response(200, body='This is my view')
+
+    status, headers, body = call(app, http_scope())
+    assert status == 200
+    assert body == b'THIS IS MY VIEW my suffix'
+
+
+def test_pipeline_wrap_coroutine():
+    pipeline = Pipeline()
+    pipeline.add(capitalize)
+
+    async def handler(request):
+        return Response(200, body='async')
+
+    wrapped = pipeline.wrap(handler)
+    assert asyncio.iscoroutinefunction(wrapped)
+
+    async def run():
+        return await wrapped(None)
+
+    assert asyncio.run(run()).body == 'ASYNC'
+
+
+def test_asgi_lifespan():
+    app = RoutingApplication()
+    messages = [
+        {'type': 'lifespan.startup'},
+        {'type': 'lifespan.shutdown'}
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app({'type': 'lifespan'}, receive, send))
+    assert sent == [
+        {'type': 'lifespan.startup.complete'},
+        {'type': 'lifespan.shutdown.complete'}
+    ]
+
+
+def test_asgi_unsupported_scope():
+    app = RoutingApplication()
+
+    async def receive():
+        pass
+
+    async def send(message):
+        pass
+
+    with pytest.raises(NotImplementedError):
+        asyncio.run(app({'type': 'websocket'}, receive, send))
+
+
+def test_asgi_route_pipeline():
+    app = RoutingApplication()
+    route_pipeline = Pipeline()
+    route_pipeline.add(capitalize)
+
+    @app.routes.register('/{name}', pipeline=route_pipeline)
+    async def view(request, name):
+        return Response(200, body=f'Hello {name}')
+
+    status, headers, body = call(app, http_scope(path='/bob'))
+    assert status == 200
+    assert body == b'HELLO BOB'
+
+
+def test_asgi_route_pipeline_sync_endpoint():
+    app = RoutingApplication()
+    route_pipeline = Pipeline()
+    route_pipeline.add(suffix, order=1)
+    route_pipeline.add(capitalize, order=2)
+
+    @app.routes.register('/{name}', pipeline=route_pipeline)
+    def view(request, name):
+        return Response(200, body=f'Hello {name}')
+
+    status, headers, body = call(app, http_scope(path='/bob'))
+    assert status == 200
+    assert body == b'HELLO BOB my suffix'
+
+
+def test_asgi_concurrent_blocking_pipeline():
+    # Blocking middlewares around a blocking endpoint must not
+    # exhaust the worker threads, even with a tiny default executor.
+    app = RoutingApplication()
+    calls = []
+
+    def tracking(handler, config=None):
+        calls.append(handler)
+        return capitalize(handler, config)
+
+    app.pipeline.add(tracking, order=1)
+    app.pipeline.add(suffix, order=2)
+    app.pipeline.add(capitalize, order=3)
+
+    @app.routes.register('/')
+    def view(request):
+        time.sleep(0.01)
+        return Response(200, body='view')
+
+    async def requests():
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=2))
+
+        async def request():
+            sent = []
+
+            async def receive():
+                return {'type': 'http.request', 'body': b''}
+
+            async def send(message):
+                sent.append(message)
+
+            await app(http_scope(), receive, send)
+            return b''.join(message.get('body', b'') for message in sent)
+
+        return await asyncio.wait_for(
+            asyncio.gather(*(request() for _ in range(8))), timeout=10)
+
+    assert asyncio.run(requests()) == [b'VIEW MY SUFFIX'] * 8
+    # The middleware is called once per compilation.
+    assert len(calls) == 1
+
+
+def test_asgi_iterable_body_off_loop():
+    app = RoutingApplication()
+    threads = []
+
+    def chunks():
+        for chunk in (b'a', b'b', b'c'):
+            threads.append(threading.get_ident())
+            yield chunk
+
+    @app.routes.register('/')
+    async def view(request):
+        threads.append(threading.get_ident())
+        return Response(200, body=chunks())
+
+    status, headers, body = call(app, http_scope())
+    assert status == 200
+    assert body == b'abc'
+    loop_thread, *chunk_threads = threads
+    assert len(chunk_threads) == 3
+    assert loop_thread not in chunk_threads
+
+
+def test_asgi_max_body_size():
+
+    class LimitedRequest(AsyncRequest):
+        max_body_size = 10
+        spool_size = 4
+
+    app = RoutingApplication(async_request_factory=LimitedRequest)
+    calls = []
+
+    @app.routes.register('/', methods=['POST'])
+    def view(request):
+        calls.append(request.body.read())
+        return Response(200, body='ok')
+
+    status, headers, body = call(
+        app, http_scope(method='POST', headers=[(b'content-length', b'50')]),
+        body=b'x' * 50
+    )
+    assert status == 413
+
+    # Without a length, the size is checked while receiving.
+    status, headers, body = call(
+        app, http_scope(method='POST'), body=b'x' * 50)
+    assert status == 413
+    assert calls == []
+
+    status, headers, body = call(
+        app, http_scope(method='POST'), body=b'some body')
+    assert status == 200
+    assert calls == [b'some body']
@@ -1,3 +1,4 @@
+import re
 import pytest
 from kavallerie.cors import CORSPolicy
 
@@ -213,3 +214,103 @@ def test_policy_origin_preflight():
         ('Access-Control-Allow-Origin', 'http://example.com'),
         ('Vary', 'Origin')
     ]
+
+
+def test_policy_cached_preflight():
+    cors = CORSPolicy(origin='http://example.com', methods=['GET'])
+    headers = cors.preflight(origin='http://example.com')
+    headers['X-Other'] = 'value'
+
+    again = cors.preflight(origin='http://example.com')
+    assert again is not headers
+    assert list(again.items()) == [
+        ('Access-Control-Allow-Origin', 'http://example.com'),
+        ('Vary', 'Origin'),
+        ('Access-Control-Allow-Methods', 'GET'),
+    ]
+    assert len(cors._preflights) == 1
+
+    cors.preflight(origin='http://example.com', acr_method='POST')
+    assert len(cors._preflights) == 2
+
+
+def test_policy_preflight_cache_size():
+
+    class SmallPolicy(CORSPolicy):
+        preflight_cache_size = 2
+
+    cors = SmallPolicy()
+    for method in ('GET', 'POST', 'PUT'):
+        assert list(cors.preflight(acr_method=method).items()) == [
+            ('Access-Control-Allow-Methods', method)
+        ]
+    assert list(cors._preflights) == [
+        (None, 'POST', None), (None, 'PUT', None)]
+
+
+def test_policy_replace():
+    cors = CORSPolicy(methods=['GET'])
+    assert list(cors.headers().items()) == [
+        ('Access-Control-Allow-Origin', '*'),
+        ('Access-Control-Allow-Methods', 'GET')
+    ]
+    cors = cors._replace(methods=['POST'])
+    assert isinstance(cors, CORSPolicy)
+    assert list(cors.headers().items()) == [
+        ('Access-Control-Allow-Origin', '*'),
+        ('Access-Control-Allow-Methods', 'POST')
+    ]
+
+
+def test_policy_multiple_origins():
+    cors = CORSPolicy(
+        origins=['https://a.com', 'https://b.com'],
+        origin_patterns=[
+            'https://*.tenants.com',
+            re.compile(r'http://localhost:\d+')
+        ],
+        methods=['GET']
+    )
+    assert cors.origin_allowed('https://a.com')
+    assert cors.origin_allowed('https://client.tenants.com')
+    assert cors.origin_allowed('http://localhost:8080')
+    assert not cors.origin_allowed('https://c.com')
+    assert not cors.origin_allowed('https://tenants.com')
+    assert not cors.origin_allowed('https://evil.com/.tenants.com')
+    assert not cors.origin_allowed('https://client.tenants.com.evil.com')
+
+    headers = cors.preflight(origin='https://client.tenants.com')
+    assert list(headers.items()) == [
+        ('Access-Control-Allow-Origin', 'https://client.tenants.com'),
+        ('Vary', 'Origin'),
+        ('Access-Control-Allow-Methods', 'GET'),
+    ]
+
+    headers = cors.preflight(origin='https://c.com')
+    assert list(headers.items()) == [
+        ('Vary', 'Origin'),
+        ('Access-Control-Allow-Methods', 'GET'),
+    ]
+
+    headers = cors.headers(origin='https://b.com')
+    assert list(headers.items()) == [
+        ('Access-Control-Allow-Origin', 'https://b.com'),
+        ('Vary', 'Origin'),
+        ('Access-Control-Allow-Methods', 'GET'),
+    ]
+
+    # Without an origin, no origin is allowed.
+    headers = cors.headers()
+    assert list(headers.items()) == [
+        ('Access-Control-Allow-Methods', 'GET'),
+    ]
+    headers = CORSPolicy(origins=['https://a.com']).headers()
+    assert 'Access-Control-Allow-Origin' not in headers
+
+
+def test_policy_single_origin_allowed():
+    assert CORSPolicy().origin_allowed('https://a.com')
+    cors = CORSPolicy(origin='https://a.com')
+    assert cors.origin_allowed('https://a.com')
+    assert not cors.origin_allowed('https://b.com')
+    assert not cors.multiple_origins
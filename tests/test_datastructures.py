@@ -1,7 +1,7 @@
 import pytest
 import hamcrest
 from frozendict import frozendict
-from kavallerie.datastructures import MultiDict
+from kavallerie.datastructures import MultiDict, LRUCache
 
 
 def test_data_wrong_values():
@@ -86,3 +86,17 @@ def test_empty_value():
         'contact': '',
         'email': 'test@example.com'
     }
+
+
+def test_lru_cache():
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+    cache = LRUCache(2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache.get('a') == 1
+    cache['c'] = 3
+    assert list(cache) == ['a', 'c']
+    assert cache.get('b') is None
+    assert cache.get('b', 42) == 42
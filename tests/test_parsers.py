@@ -0,0 +1,94 @@
+import pytest
+from io import BytesIO
+from horseman.exceptions import HTTPError
+from kavallerie.parsers import Field, FilePart, stream_form
+from kavallerie.request import Request
+
+
+MULTIPART = (
+    b'--foo\r\n'
+    b'Content-Disposition: form-data; name="text"\r\n\r\n'
+    b'some text\r\n'
+    b'--foo\r\n'
+    b'Content-Disposition: form-data; name="upload"; filename="a.txt"\r\n'
+    b'Content-Type: text/plain\r\n\r\n'
+    + b'x' * 5000 + b'\r\n'
+    b'--foo--\r\n'
+)
+
+
+def multipart_environ(environ, body=MULTIPART):
+    return {
+        **environ,
+        'REQUEST_METHOD': 'POST',
+        'CONTENT_TYPE': 'multipart/form-data; boundary=foo',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': BytesIO(body),
+    }
+
+
+def test_stream_multipart(environ):
+    request = Request(None, environ=multipart_environ(environ))
+    parts = request.stream_form(spool_size=1024)
+    field = next(parts)
+    assert field == Field('text', 'some text')
+
+    upload = next(parts)
+    assert isinstance(upload, FilePart)
+    assert upload.name == 'upload'
+    assert upload.filename == 'a.txt'
+    assert upload.content_type == 'text/plain'
+    assert upload.size == 5000
+    assert upload.file._rolled  # spooled to disk
+    assert upload.file.read() == b'x' * 5000
+    assert list(parts) == []
+
+
+def test_stream_multipart_incremental():
+    chunks = []
+
+    class Body(BytesIO):
+        def read(self, size=-1):
+            chunk = super().read(size)
+            chunks.append(chunk)
+            return chunk
+
+    parts = stream_form(
+        Body(MULTIPART), 'multipart/form-data; boundary=foo',
+        content_length=len(MULTIPART), chunk_size=100)
+    assert next(parts) == Field('text', 'some text')
+    # The field is yielded before the whole body is read.
+    assert sum(map(len, chunks)) < len(MULTIPART)
+
+
+def test_stream_urlencoded():
+    body = b'a=1&b=hello+world&a=%C3%A9'
+    parts = stream_form(
+        BytesIO(body), 'application/x-www-form-urlencoded',
+        content_length=len(body), chunk_size=3)
+    assert list(parts) == [
+        Field('a', '1'),
+        Field('b', 'hello world'),
+        Field('a', 'é'),
+    ]
+
+
+def test_stream_max_size(environ):
+    request = Request(None, environ=multipart_environ(environ))
+    with pytest.raises(HTTPError) as exc:
+        next(request.stream_form(max_size=100))
+    assert exc.value.status == 413
+
+    # Without content length, the size is checked while reading.
+    parts = stream_form(
+        BytesIO(MULTIPART), 'multipart/form-data; boundary=foo',
+        max_size=1000, chunk_size=100)
+    with pytest.raises(HTTPError) as exc:
+        list(parts)
+    assert exc.value.status == 413
+
+
+def test_stream_unknown_content_type():
+    with pytest.raises(HTTPError) as exc:
+        next(stream_form(BytesIO(b'{}'), 'application/json'))
+    assert exc.value.status == 415
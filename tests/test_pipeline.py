@@ -100,3 +100,114 @@ def test_middleware_factory_config_freeze():
         'somestuff': {'a': 'b'},
         'this': 'that'
     }
+
+
+def test_pipeline_compiled_cache(environ):
+    calls = []
+
+    def tracking(app, config=None):
+        calls.append(config)
+        return app
+
+    pipeline = Pipeline()
+    pipeline.add(tracking)
+    config = {'a': 1}
+
+    wrapped = pipeline.wrap(handler, config)
+    assert pipeline.wrap(handler, config) is wrapped
+    assert calls == [config]
+
+    # Another configuration instance compiles a new handler.
+    pipeline.wrap(handler, {'a': 1})
+    assert len(calls) == 2
+
+    # Mutating the chain invalidates the compiled handlers.
+    pipeline.add(capitalize, order=1)
+    request = Request(None, environ=environ)
+    response = pipeline.wrap(handler, config)(request)
+    assert response.body == 'THIS IS MY VIEW'
+    assert len(calls) == 3
+
+    pipeline.remove(capitalize, order=1)
+    response = pipeline.wrap(handler, config)(request)
+    assert response.body == 'This is my view'
+    assert len(calls) == 4
+
+    pipeline.clear()
+    assert pipeline.wrap(handler, config) is handler
+
+
+def test_route_pipeline():
+    app = RoutingApplication()
+    app.pipeline.add(suffix)
+
+    route_pipeline = Pipeline()
+    route_pipeline.add(capitalize)
+
+    @app.routes.register('/loud/{name}', pipeline=route_pipeline)
+    def loud(request, name):
+        return Response(200, body=f'Hello {name}')
+
+    @app.routes.register('/quiet/{name}')
+    def quiet(request, name):
+        return Response(200, body=f'Hello {name}')
+
+    endpoint = app.routes.match_method('/loud/bob', 'GET').endpoint
+    assert endpoint.metadata == {'pipeline': route_pipeline}
+    assert endpoint.endpoint is not loud
+    assert endpoint.endpoint.__wrapped__ is loud
+
+    test = WSGIApp(app)
+    response = test.get('/loud/bob')
+    assert response.body == b'HELLO BOB my suffix'
+
+    response = test.get('/quiet/bob')
+    assert response.body == b'Hello bob my suffix'
+
+    # The params are given to the endpoint, without `request.route`.
+    request = Request(None, environ={'REQUEST_METHOD': 'GET'})
+    assert endpoint(request, name='alice').body == 'HELLO ALICE'
+
+
+def test_middleware_factory_config_cache():
+
+    class MF(MiddlewareFactory):
+        def __call__(self, handler, appconf):
+            return handler
+
+    mf1 = MF(this='that', somestuff={'a': 'b'}, someother=[1, 2, 3])
+    mf2 = MF(this='that', somestuff={'a': 'b'}, someother=[1, 2, 3])
+    assert mf1.config is mf2.config
+    assert mf1.config['this'] == 'that'
+    assert mf1.config['somestuff'] == {'a': 'b'}
+
+    # Keys named after mapping methods are values like any other.
+    mf = MF(items=[1], get='x')
+    assert mf.config['items'] == (1,)
+    assert mf.config['get'] == 'x'
+
+    # Values of different types are not mixed up.
+    assert MF(flag=True).config is not MF(flag=1).config
+    assert MF(items=[1]).config is not MF(items=(1,)).config
+
+    # Unhashable values are frozen, without caching.
+    mf3 = MF(this=bytearray(b'that'))
+    mf4 = MF(this=bytearray(b'that'))
+    assert mf3.config == mf4.config
+    assert mf3.config is not mf4.config
+
+
+def test_pipeline_compiled_cache_bounded():
+
+    class SmallPipeline(Pipeline):
+        compiled_cache_size = 2
+
+    pipeline = SmallPipeline()
+    pipeline.add(capitalize)
+    configs = [{'index': index} for index in range(3)]
+    for config in configs:
+        pipeline.wrap(handler, config)
+
+    # The oldest configuration is no longer referenced.
+    assert len(pipeline._compiled) == 2
+    assert [conf for conf, _ in pipeline._compiled.values()] == configs[1:]
@@ -27,3 +27,51 @@ def test_request_flags(environ):
     assert request.flags.something_else is None
     request.flags.something_else = "non bool value"
     assert request.flags.something_else == "non bool value"
+
+
+def test_request_accept(environ):
+    request = Request(None, environ={
+        **environ,
+        'HTTP_ACCEPT': 'text/html;q=0.8, application/json, */*;q=0.1',
+        'HTTP_ACCEPT_ENCODING': 'gzip, deflate;q=0.5, br;q=0',
+    })
+    assert request.accept == (
+        ('application/json', 1.0),
+        ('text/html', 0.8),
+        ('*/*', 0.1)
+    )
+    assert request.accept is request.accept
+    assert request.accept.best('text/html', 'application/json') == \
+        'application/json'
+    assert request.accept.quality('image/png') == 0.1
+    assert request.accept_encoding.best('br', 'deflate') == 'deflate'
+    assert request.accept_encoding.quality('br') == 0.0
+    assert request.accept_language == ()
+    assert request.accept_language.best('en') is None
+
+
+def test_request_accept_specificity(environ):
+    request = Request(None, environ={
+        **environ,
+        'HTTP_ACCEPT': 'text/*, text/html;q=0, */*;q=0.5',
+        'HTTP_ACCEPT_ENCODING': '*, gzip;q=0',
+    })
+    assert request.accept.quality('text/html') == 0.0
+    assert request.accept.quality('text/plain') == 1.0
+    assert request.accept.quality('image/png') == 0.5
+    assert request.accept.best('text/html', 'image/png') == 'image/png'
+    assert request.accept_encoding.quality('gzip') == 0.0
+    assert request.accept_encoding.best('gzip', 'deflate') == 'deflate'
+
+
+def test_request_prefetch(environ):
+
+    class EagerRequest(Request):
+        eager_attributes = ('cookies', 'query')
+
+    request = EagerRequest(None, environ={
+        **environ, 'HTTP_COOKIE': 'a=b', 'QUERY_STRING': 'c=d'})
+    assert {'cookies', 'query'} <= set(request.__dict__)
+    assert 'accept' not in request.__dict__
+    request.prefetch('accept')
+    assert 'accept' in request.__dict__
@@ -0,0 +1,182 @@
+import os
+import orjson
+import pytest
+from wsgiref.util import FileWrapper
+from kavallerie.app import RoutingApplication
+from kavallerie.response import (
+    Response, JSONResponse, FileBody, byte_range, etag_matches)
+from webtest import TestApp as WebApp
+
+
+@pytest.fixture
+def datafile(tmp_path):
+    path = tmp_path / 'data.txt'
+    path.write_bytes(b'0123456789' * 10)
+    return path
+
+
+def test_byte_range():
+    assert byte_range('bytes=0-9', 100) == (0, 10)
+    assert byte_range('bytes=90-', 100) == (90, 10)
+    assert byte_range('bytes=-5', 100) == (95, 5)
+    assert byte_range('bytes=95-200', 100) == (95, 5)
+    assert byte_range('bytes=0-1,5-6', 100) is None
+    assert byte_range('items=0-1', 100) is None
+    assert byte_range('bytes=a-b', 100) is None
+    assert byte_range('bytes=5-3', 100) is None
+    assert byte_range('bytes=-', 100) is None
+    assert byte_range('bytes=-5-', 100) is None
+    assert byte_range('bytes=-500', 100) == (0, 100)
+    with pytest.raises(ValueError):
+        byte_range('bytes=100-', 100)
+    with pytest.raises(ValueError):
+        byte_range('bytes=-0', 100)
+
+
+def test_from_path(datafile):
+    response = Response.from_path(datafile, filename='data.txt')
+    assert response.status == 200
+    assert isinstance(response.body, FileBody)
+    assert response.headers['Content-Type'] == 'text/plain'
+    assert response.headers['Content-Length'] == '100'
+    assert response.headers['Content-Disposition'] == (
+        'attachment;filename=data.txt')
+    assert response.headers['ETag'].startswith('"')
+    assert response.headers['Last-Modified'].endswith('GMT')
+    assert b''.join(response) == b'0123456789' * 10
+    response.close()
+    assert response.body.file.closed
+
+
+def test_from_fd_range(datafile, environ):
+    fd = os.open(datafile, os.O_RDONLY)
+    response = Response.from_fd(
+        fd, {**environ, 'HTTP_RANGE': 'bytes=5-14'}, chunk_size=4)
+    assert response.status == 206
+    assert response.headers['Content-Range'] == 'bytes 5-14/100'
+    assert response.headers['Content-Length'] == '10'
+    assert list(response) == [b'5678', b'9012', b'34']
+    response.close()
+
+
+def test_from_path_range_mismatch(datafile, environ):
+    response = Response.from_path(datafile, {
+        **environ, 'HTTP_RANGE': 'bytes=5-14', 'HTTP_IF_RANGE': '"other"'})
+    assert response.status == 200
+    response.close()
+
+    response = Response.from_path(
+        datafile, {**environ, 'HTTP_RANGE': 'bytes=500-'})
+    assert response.status == 416
+    assert response.headers['Content-Range'] == 'bytes */100'
+
+    response = Response.from_path(
+        datafile, {**environ, 'HTTP_RANGE': 'bytes=14-5'})
+    assert response.status == 200
+    assert response.headers['Content-Length'] == '100'
+    response.close()
+
+
+def test_file_wrapper(datafile, environ):
+    application = RoutingApplication()
+    closed = []
+
+    @application.routes.register('/')
+    def handler(request):
+        response = Response.from_path(datafile, request)
+        response.add_finisher(closed.append)
+        return response
+
+    headers = []
+    iterable = application(
+        {**environ, 'PATH_INFO': '/', 'HTTP_RANGE': 'bytes=90-',
+         'wsgi.file_wrapper': FileWrapper},
+        lambda status, h: headers.append((status, h))
+    )
+    assert isinstance(iterable, FileWrapper)
+    assert b''.join(iterable) == b'0123456789'
+    assert headers[0][0] == '206 Partial Content'
+    iterable.close()
+    assert len(closed) == 1
+
+
+def test_file_response_webtest(datafile):
+    application = RoutingApplication()
+
+    @application.routes.register('/')
+    def handler(request):
+        return Response.from_path(datafile, request)
+
+    app = WebApp(application)
+    response = app.get('/', headers={'Range': 'bytes=-3'})
+    assert response.status == '206 Partial Content'
+    assert response.body == b'789'
+
+
+def test_json_response():
+    response = JSONResponse(201, {1: 'a'}, option=orjson.OPT_NON_STR_KEYS)
+    assert response.status == 201
+    assert response.body == b'{"1":"a"}'
+    assert response.headers['Content-Type'] == 'application/json'
+    assert response.headers['Content-Length'] == '9'
+
+    response = JSONResponse(body={}, headers={'X-Test': 'yes'})
+    assert response.headers['X-Test'] == 'yes'
+    assert response.headers['Content-Type'] == 'application/json'
+
+    # The prebuilt headers are copied, never shared.
+    response.headers['X-Other'] = 'no'
+    assert 'X-Other' not in JSONResponse.headers_template
+
+
+def test_json_response_option():
+
+    class SortedJSON(JSONResponse):
+        option = orjson.OPT_SORT_KEYS
+
+    assert SortedJSON(body={'b': 1, 'a': 2}).body == b'{"a":2,"b":1}'
+    assert SortedJSON(body={'b': 1, 'a': 2}, option=0).body == (
+        b'{"b":1,"a":2}')
+
+
+def test_json_stream():
+    response = JSONResponse.stream(({'id': i} for i in range(3)))
+    assert response.headers['Content-Type'] == 'application/json'
+    assert b''.join(response) == b'[{"id":0},{"id":1},{"id":2}]'
+
+    response = JSONResponse.stream([])
+    assert b''.join(response) == b'[]'
+
+    response = JSONResponse.stream(range(1000), chunk_size=100)
+    chunks = list(response)
+    assert len(chunks) > 1
+    assert orjson.loads(b''.join(chunks)) == list(range(1000))
+
+
+def test_ndjson_stream():
+    response = JSONResponse.stream(
+        ({'id': i} for i in range(2)), ndjson=True)
+    assert response.headers['Content-Type'] == 'application/x-ndjson'
+    assert b''.join(response) == b'{"id":0}\n{"id":1}\n'
+
+
+def test_etag_matches():
+    assert etag_matches('"a"', '"a"')
+    assert etag_matches('"a"', '"b", W/"a"')
+    assert etag_matches('W/"a"', '"a"')
+    assert etag_matches('"a"', '*')
+    assert not etag_matches('"a"', '"b"')
+    assert not etag_matches('"a"', 'W/"a"', weak=False)
+    assert not etag_matches('W/"a"', '"a"', weak=False)
+    assert etag_matches('"a"', 'W/"b", "a"', weak=False)
+
+
+def test_conditional_file_response(datafile, environ):
+    response = Response.from_path(datafile)
+    etag = response.headers['ETag']
+    response = response.conditional(
+        {**environ, 'HTTP_IF_NONE_MATCH': etag})
+    assert response.status == 304
+    assert response.body is None
+    assert 'Content-Length' not in response.headers
+    assert list(response) == []